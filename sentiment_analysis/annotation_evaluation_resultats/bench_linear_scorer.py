@@ -0,0 +1,81 @@
+"""
+Benchmark : vectorizer.transform + model.predict (pickles) contre LinearScorer.
+
+Exporte le modèle dans un répertoire temporaire, vérifie que les prédictions
+sont identiques sur tout le CSV, puis mesure le débit texte par texte et par lot.
+
+    python bench_linear_scorer.py --vectorizer tfidf_vectorizer.pkl \
+        --model best_sentiment_model.pkl --csv data_with_sentiment.csv
+"""
+import argparse
+import pickle
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from linear_scorer import LinearScorer, export_linear
+
+
+def throughput(label, func, texts, single):
+    start = time.perf_counter()
+    if single:
+        for text in texts:
+            func([text])
+    else:
+        func(texts)
+    elapsed = time.perf_counter() - start
+    rate = len(texts) / elapsed
+    print(f"{label:<30} {rate:12,.0f} textes/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pickles sklearn vs LinearScorer")
+    parser.add_argument('--vectorizer', default='tfidf_vectorizer.pkl')
+    parser.add_argument('--model', default='best_sentiment_model.pkl')
+    parser.add_argument('--csv', default='data_with_sentiment.csv')
+    parser.add_argument('--column', default='Tweet')
+    parser.add_argument('--single', type=int, default=2000,
+                        help='Nombre de textes pour la mesure texte par texte')
+    args = parser.parse_args()
+
+    with open(args.vectorizer, 'rb') as f:
+        vectorizer = pickle.load(f)
+    with open(args.model, 'rb') as f:
+        bundle = pickle.load(f)
+    model, encoder = bundle['model'], bundle['encoder']
+    texts = pd.read_csv(args.csv, usecols=[args.column])[args.column].fillna('').astype(str).tolist()
+    print(f"{bundle.get('name', type(model).__name__)}, {len(texts)} textes\n")
+
+    def sklearn_predict(batch):
+        return encoder.inverse_transform(model.predict(vectorizer.transform(batch)))
+
+    tmp = tempfile.mkdtemp()
+    try:
+        export_linear(vectorizer, model, encoder, tmp)
+        scorer = LinearScorer.load(tmp)
+
+        expected = sklearn_predict(texts)
+        got = scorer.predict(texts)
+        mismatches = int(np.sum(expected.astype(str) != got.astype(str)))
+        print(f"Prédictions différentes: {mismatches}\n")
+
+        single = texts[:args.single]
+        base = throughput("sklearn, texte par texte", sklearn_predict, single, True)
+        fast = throughput("LinearScorer, texte par texte", scorer.predict, single, True)
+        print(f"{'':<30} {fast / base:11.1f}x\n")
+        base = throughput("sklearn, lot complet", sklearn_predict, texts, False)
+        fast = throughput("LinearScorer, lot complet", scorer.predict, texts, False)
+        print(f"{'':<30} {fast / base:11.1f}x")
+    finally:
+        shutil.rmtree(tmp)
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Annotation semi-automatique par mots-clés, vectorisée.
+
+L'ancien annotate_sentiment testait ``word in text_lower`` pour chacun des
+33 mots-clés, tweet par tweet, et trouvait aussi les mots-clés à l'intérieur
+d'autres mots ("bon" dans "bonjour"). Ici les deux lexiques sont compilés en
+une seule expression régulière en forme de trie (préfixes factorisés, coût
+quasi indépendant de la taille du lexique), bornée par des limites de mot,
+avec une terminaison optionnelle e/s/es pour le pluriel et le féminin.
+Une passe sur la Series donne les compteurs positifs / négatifs en tableaux
+NumPy.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# Définir des mots-clés (à affiner selon votre corpus)
+KEYWORDS_POSITIVE = [
+    'excellent', 'bon', 'bonne', 'super', 'bien', 'merci', 'félicitations',
+    'bravo', 'génial', 'parfait', 'satisfait', 'qualité', 'succès',
+    'réussite', 'compétent', 'professionnel', 'efficace'
+]
+
+KEYWORDS_NEGATIVE = [
+    'problème', 'mauvais', 'mauvaise', 'panne', 'bug', 'lent', 'cher',
+    'difficile', 'compliqué', 'décevant', 'mécontentent', 'nul',
+    'incompétent', 'arnaque', 'échec', 'frustrant'
+]
+
+# Terminaisons acceptées après un mot-clé (pluriel / féminin)
+INFLECTION_SUFFIX = r"(?:es|e|s)?"
+
+
+def trie_pattern(words):
+    """Alternative regex équivalente à '|'.join(words), factorisée par préfixes"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class KeywordAnnotator:
+    def __init__(self, positive=KEYWORDS_POSITIVE, negative=KEYWORDS_NEGATIVE,
+                 suffix=INFLECTION_SUFFIX):
+        self.positive = {w.lower() for w in positive}
+        self.negative = {w.lower() for w in negative}
+        keywords = self.positive | self.negative
+        self.regex = re.compile(rf"(?<!\w)({trie_pattern(keywords)}){suffix}(?!\w)")
+
+    def count(self, texts):
+        """Nombre de mots-clés positifs et négatifs distincts présents dans chaque texte"""
+        texts = pd.Series(texts, dtype=object).fillna('').astype(str)
+        matches = texts.str.lower().str.findall(self.regex)
+
+        pos = np.zeros(len(matches), dtype=np.int32)
+        neg = np.zeros(len(matches), dtype=np.int32)
+        for i, found in enumerate(matches):
+            if found:
+                found = set(found)
+                pos[i] = len(found & self.positive)
+                neg[i] = len(found & self.negative)
+        return pos, neg
+
+    def annotate(self, texts):
+        """'positif', 'négatif' ou 'neutre' pour chaque texte"""
+        pos, neg = self.count(texts)
+        return np.select([pos > neg, neg > pos], ['positif', 'négatif'], default='neutre')
+
+
+def annotate_sentiment(text, keywords_positive=KEYWORDS_POSITIVE,
+                       keywords_negative=KEYWORDS_NEGATIVE):
+    """Annotation d'un seul texte (même règle que KeywordAnnotator)"""
+    return KeywordAnnotator(keywords_positive, keywords_negative).annotate([text])[0]
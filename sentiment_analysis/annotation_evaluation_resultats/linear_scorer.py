@@ -0,0 +1,275 @@
+"""
+Score linéaire compilé : TF-IDF + modèle linéaire sans passer par sklearn.
+
+Pour les modèles du notebook (MultinomialNB, LogisticRegression, SVC linéaire,
+LinearSVC, SGDClassifier), la prédiction se réduit à un produit creux
+X @ W + b suivi d'un argmax (ou d'un vote un-contre-un pour SVC). export_linear
+extrait du vectoriseur et du modèle pickles :
+
+- le vocabulaire (termes dans l'ordre des colonnes, reconstruit en dict au chargement),
+- le vecteur idf et la configuration de l'analyseur (minuscules, accents, n-grammes),
+- les coefficients W, les biais b et les libellés décodés par le LabelEncoder,
+
+dans un bundle sans pickle (model_bundle.py). LinearScorer refait
+tokenisation, pondération et score par lots, sans les validations de sklearn à
+chaque appel.
+
+    export_linear(vectorizer, bundle['model'], bundle['encoder'], "sentiment_model")
+    scorer = LinearScorer.load("sentiment_model")
+    scorer.predict(["bravo pour la rentrée"])
+"""
+import re
+import unicodedata
+
+import numpy as np
+import scipy.sparse as sp
+
+from model_bundle import read_bundle, write_bundle
+
+
+def strip_accents_unicode(text):
+    """Même transformation que sklearn (strip_accents='unicode')"""
+    try:
+        text.encode("ASCII", errors="strict")
+        return text
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize("NFKD", text)
+        return "".join(c for c in normalized if not unicodedata.combining(c))
+
+
+def _analyzer_config(vectorizer):
+    """Paramètres de l'analyseur, en refusant ce que LinearScorer ne reproduit pas"""
+    params = vectorizer.get_params()
+    unsupported = [name for name in ('preprocessor', 'tokenizer') if params.get(name) is not None]
+    if params.get('analyzer') != 'word':
+        unsupported.append('analyzer')
+    if params.get('strip_accents') not in (None, 'unicode'):
+        unsupported.append('strip_accents')
+    if params.get('binary') or not params.get('use_idf', True) or params.get('norm') not in ('l2', None):
+        unsupported.append('binary/use_idf/norm')
+    if unsupported:
+        raise ValueError(f"Configuration du vectoriseur non supportée: {', '.join(unsupported)}")
+
+    stop_words = params.get('stop_words')
+    if isinstance(stop_words, str):
+        stop_words = sorted(vectorizer.get_stop_words())
+    return {
+        'lowercase': bool(params['lowercase']),
+        'strip_accents': params['strip_accents'],
+        'token_pattern': params['token_pattern'],
+        'ngram_range': list(params['ngram_range']),
+        'stop_words': sorted(stop_words) if stop_words else None,
+        'sublinear_tf': bool(params['sublinear_tf']),
+        'norm': params['norm'],
+    }
+
+
+def _linear_parameters(model):
+    """(kind, W de forme (n_features, n_sorties), b) pour les modèles supportés"""
+    if hasattr(model, 'feature_log_prob_') and hasattr(model, 'class_log_prior_'):
+        # Naive Bayes multinomial : log P(c) + X @ log P(t|c), argmax
+        return 'argmax', model.feature_log_prob_, model.class_log_prior_
+    if not hasattr(model, 'coef_'):
+        raise ValueError(f"{type(model).__name__} n'est pas un modèle linéaire")
+
+    coef = model.coef_
+    coef = coef.toarray() if sp.issparse(coef) else np.asarray(coef)
+    intercept = np.asarray(model.intercept_, dtype=np.float64)
+    n_classes = len(model.classes_)
+    if n_classes == 2:
+        # Une seule sortie : classe 1 si le score est positif (SVC binaire compris)
+        return 'binary', coef, intercept
+    if hasattr(model, 'dual_coef_'):
+        # SVC (libsvm) : un classifieur par paire de classes, prédiction par vote
+        return 'ovo', coef, intercept
+    return 'argmax', coef, intercept
+
+
+def _proba_method(model, kind):
+    """Comment predict_proba est obtenu à partir des scores linéaires"""
+    if hasattr(model, 'feature_log_prob_'):
+        return 'softmax'                     # Naive Bayes : log-vraisemblances jointes
+    if type(model).__name__ == 'LogisticRegression':
+        if kind == 'binary':
+            return 'sigmoid'
+        if getattr(model, 'multi_class', None) == 'ovr' or model.solver == 'liblinear':
+            return 'ovr'
+        return 'softmax'
+    return 'decision'                        # pas de probabilités : softmax des scores
+
+
+def export_linear(vectorizer, model, encoder, path, name=None, clean=False):
+    """
+    Écrit vocabulaire, idf, W, b, libellés et configuration dans un bundle
+    (model_bundle.py) : répertoire, ou archive si path finit par .zip.
+    clean=True seulement si le vectoriseur a été entraîné sur la sortie de
+    clean_tweet (écrit dans le manifeste, suivi par le service). Retourne le
+    manifeste.
+    """
+    import sklearn
+
+    analyzer = _analyzer_config(vectorizer)
+    kind, coef, intercept = _linear_parameters(model)
+
+    terms = [None] * len(vectorizer.vocabulary_)
+    for term, column in vectorizer.vocabulary_.items():
+        terms[column] = term
+
+    labels = [str(label) for label in encoder.inverse_transform(model.classes_)]
+    return write_bundle(
+        path, terms,
+        idf=vectorizer.idf_,
+        coef=np.asarray(coef, dtype=np.float64).T,
+        intercept=intercept,
+        labels=labels,
+        kind=kind,
+        analyzer=analyzer,
+        preprocessing={'clean_tweet': clean},
+        model={'name': name or type(model).__name__, 'type': type(model).__name__,
+               'proba': _proba_method(model, kind)},
+        versions={'scikit-learn': sklearn.__version__},
+    )
+
+
+class LinearScorer:
+    def __init__(self, terms, idf, coef, intercept, labels, kind, analyzer, proba='decision'):
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+        self.idf = idf
+        self.coef = coef
+        self.intercept = intercept
+        self.labels = np.asarray(labels, dtype=object)
+        self.kind = kind
+        self.analyzer = analyzer
+        self.proba = proba
+
+        self.lowercase = analyzer['lowercase']
+        self.strip_accents = analyzer['strip_accents'] == 'unicode'
+        self.token_re = re.compile(analyzer['token_pattern'])
+        self.min_n, self.max_n = analyzer['ngram_range']
+        self.stop_words = frozenset(analyzer['stop_words'] or ())
+        if kind == 'ovo':
+            n = len(labels)
+            self.pairs = np.array([(i, j) for i in range(n) for j in range(i + 1, n)])
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        return cls(bundle.terms, bundle.idf, bundle.coef, bundle.intercept, bundle.labels,
+                   bundle.kind, bundle.analyzer, bundle.manifest['model']['proba'])
+
+    @classmethod
+    def load(cls, path, mmap=True, verify=True):
+        return cls.from_bundle(read_bundle(path, mmap=mmap, verify=verify))
+
+    # -- vectorisation -------------------------------------------------------
+
+    def _columns(self, text):
+        """Colonnes du vocabulaire présentes dans text (avec répétitions)"""
+        if self.lowercase:
+            text = text.lower()
+        if self.strip_accents:
+            text = strip_accents_unicode(text)
+        tokens = self.token_re.findall(text)
+        if self.stop_words:
+            tokens = [t for t in tokens if t not in self.stop_words]
+
+        get = self.vocabulary.get
+        columns = []
+        for n in range(self.min_n, min(self.max_n, len(tokens)) + 1):
+            grams = tokens if n == 1 else map(' '.join, zip(*(tokens[k:] for k in range(n))))
+            for gram in grams:
+                column = get(gram)
+                if column is not None:
+                    columns.append(column)
+        return columns
+
+    def transform(self, texts):
+        """Matrice TF-IDF (CSR), identique à vectorizer.transform(texts)"""
+        indptr = [0]
+        indices = []
+        for text in texts:
+            indices.extend(self._columns(text))
+            indptr.append(len(indices))
+
+        n_rows = len(indptr) - 1
+        X = sp.csr_matrix((np.ones(len(indices)), np.asarray(indices, dtype=np.int32),
+                           np.asarray(indptr, dtype=np.int32)),
+                          shape=(n_rows, len(self.idf)))
+        X.sum_duplicates()
+
+        if self.analyzer['sublinear_tf']:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        X.data *= self.idf[X.indices]
+        if self.analyzer['norm'] == 'l2':
+            rows = np.repeat(np.arange(n_rows), np.diff(X.indptr))
+            norms = np.sqrt(np.bincount(rows, weights=X.data * X.data, minlength=n_rows))
+            norms[norms == 0] = 1
+            X.data /= norms[rows]
+        return X
+
+    # -- score ---------------------------------------------------------------
+
+    def decision_function(self, texts):
+        return self.transform(texts) @ self.coef + self.intercept
+
+    def _codes(self, scores):
+        if self.kind == 'binary':
+            return (scores[:, 0] > 0).astype(np.intp)
+        if self.kind == 'ovo':
+            # libsvm : la paire (i, j) vote i si le score est > 0, sinon j ;
+            # à égalité de votes, la première classe l'emporte
+            winners = np.where(scores > 0, self.pairs[:, 0], self.pairs[:, 1])
+            votes = np.zeros((len(scores), len(self.labels)), dtype=np.int32)
+            for k in range(winners.shape[1]):
+                votes[np.arange(len(scores)), winners[:, k]] += 1
+            return votes.argmax(axis=1)
+        return scores.argmax(axis=1)
+
+    def predict_codes(self, texts):
+        """Index dans self.labels"""
+        return self._codes(self.decision_function(texts))
+
+    def predict(self, texts):
+        """Libellés décodés ('positif', 'négatif', 'neutre')"""
+        return self.labels[self.predict_codes(texts)]
+
+    def _ovo_to_ovr(self, scores):
+        """Scores par classe à partir des scores par paire, comme SVC.decision_function"""
+        votes = np.zeros((len(scores), len(self.labels)))
+        confidences = np.zeros_like(votes)
+        for k, (i, j) in enumerate(self.pairs):
+            confidences[:, i] += scores[:, k]
+            confidences[:, j] -= scores[:, k]
+            votes[:, i] += scores[:, k] >= 0
+            votes[:, j] += scores[:, k] < 0
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+    def _proba(self, scores):
+        if self.kind == 'ovo':
+            scores = self._ovo_to_ovr(scores)
+        if self.kind == 'binary':
+            if self.proba == 'sigmoid':
+                positive = 1 / (1 + np.exp(-scores[:, 0]))
+                return np.column_stack([1 - positive, positive])
+            scores = np.column_stack([-scores[:, 0], scores[:, 0]])
+        if self.proba == 'ovr':
+            proba = 1 / (1 + np.exp(-scores))
+            return proba / proba.sum(axis=1, keepdims=True)
+        scores = scores - scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, texts):
+        """
+        Probabilités par classe (colonnes dans l'ordre de self.labels). Pour les
+        modèles sans predict_proba (SVM), softmax des scores de décision.
+        """
+        return self._proba(self.decision_function(texts))
+
+    def predict_with_proba(self, texts):
+        """(libellés, probabilités) avec une seule vectorisation"""
+        scores = self.decision_function(texts)
+        return self.labels[self._codes(scores)], self._proba(scores)
+
+    def predict_one(self, text):
+        return self.predict([text])[0]
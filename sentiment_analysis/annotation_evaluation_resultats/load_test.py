@@ -0,0 +1,124 @@
+"""
+Test de charge local pour prediction_service.py.
+
+N clients concurrents envoient des requêtes de --batch textes tirés d'un CSV
+(ou de phrases d'exemple) pendant --duration secondes. Affiche le débit, les
+latences p50 / p99 côté client et les métriques /metrics du service.
+
+    python load_test.py --url http://127.0.0.1:8000 --clients 16 --batch 1 --duration 20
+    python load_test.py --unix /tmp/sentiment.sock --csv data_with_sentiment.csv
+"""
+import argparse
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_TEXTS = [
+    "Bravo à l'UVBF pour cette excellente organisation",
+    "Encore un problème de connexion sur la plateforme, c'est frustrant",
+    "Les inscriptions sont ouvertes jusqu'au 30 septembre",
+    "Merci aux enseignants, cours de qualité",
+    "Plateforme très lente aujourd'hui, impossible de suivre le cours",
+]
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=30):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def make_connection(args):
+    if args.unix:
+        return UnixHTTPConnection(args.unix)
+    url = urlparse(args.url)
+    return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+
+
+def request(conn, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else None
+    headers = {'Content-Type': 'application/json'} if body else {}
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    data = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"{response.status}: {data[:200]!r}")
+    return json.loads(data)
+
+
+def client_loop(args, texts, deadline, latencies, errors, seed):
+    rng = random.Random(seed)
+    conn = make_connection(args)
+    while time.perf_counter() < deadline:
+        batch = rng.sample(texts, min(args.batch, len(texts)))
+        start = time.perf_counter()
+        try:
+            request(conn, 'POST', '/predict', {'texts': batch})
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(1)
+            conn.close()
+            conn = make_connection(args)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge du service de prédiction")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--unix', help='Socket Unix du service')
+    parser.add_argument('--csv', help='CSV de textes à envoyer')
+    parser.add_argument('--column', default='Tweet')
+    parser.add_argument('--clients', type=int, default=8, help='Clients concurrents')
+    parser.add_argument('--batch', type=int, default=1, help='Textes par requête')
+    parser.add_argument('--duration', type=float, default=10.0, help='Durée en secondes')
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = pd.read_csv(args.csv, usecols=[args.column])[args.column].dropna().astype(str).tolist()
+    else:
+        texts = SAMPLE_TEXTS
+
+    conn = make_connection(args)
+    print("Service:", request(conn, 'GET', '/health'))
+    conn.close()
+
+    latencies, errors = [], []
+    deadline = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=client_loop, args=(args, texts, deadline, latencies, errors, i))
+        for i in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat = np.array(latencies) * 1000
+    print(f"\n{args.clients} clients, {args.batch} texte(s) par requête, {elapsed:.1f} s")
+    print(f"Requêtes: {len(lat)}  erreurs: {len(errors)}")
+    print(f"Débit:    {len(lat) / elapsed:.1f} req/s, {len(lat) * args.batch / elapsed:.1f} textes/s")
+    if len(lat):
+        p50, p99 = np.percentile(lat, [50, 99])
+        print(f"Latence client: p50 {p50:.2f} ms, p99 {p99:.2f} ms, max {lat.max():.2f} ms")
+
+    conn = make_connection(args)
+    print("\nMétriques du service:", request(conn, 'GET', '/metrics'))
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
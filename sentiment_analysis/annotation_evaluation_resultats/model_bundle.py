@@ -0,0 +1,275 @@
+"""
+Format de bundle de modèle sans pickle, versionné.
+
+Un bundle est un répertoire (ou une archive .zip non compressée) contenant :
+
+    manifest.json        version du format, date, versions des bibliothèques,
+                         modèle, libellés, configuration du prétraitement et
+                         de l'analyseur, sha256 / dtype / shape de chaque fichier
+    vocab_blob.bin       termes du vocabulaire en UTF-8 séparés par '\\n'
+    vocab_offsets.npy    int64 (n + 1,) : le terme i occupe les octets
+                         offsets[i] à offsets[i + 1] - 2 de vocab_blob.bin
+                         (un séparateur suit chaque terme, sauf le dernier :
+                         offsets[n] = taille du blob + 1)
+    idf.npy              float64 (n_features,)
+    coef.npy             float64 (n_features, n_sorties)
+    intercept.npy        float64 (n_sorties,)
+
+Les .npy d'un répertoire sont ouverts en mémoire mappée. Par défaut
+(verify=True), read_bundle lit une fois chaque fichier pour contrôler son
+sha256 ; avec verify=False, le chargement ne lit que le manifeste et le
+vocabulaire. Rien n'est désérialisé par pickle (allow_pickle=False), le bundle
+peut donc venir d'un stockage non fiable.
+
+    python model_bundle.py convert --vectorizer tfidf_vectorizer.pkl \
+        --model best_sentiment_model.pkl --output sentiment_model
+    python model_bundle.py info sentiment_model
+"""
+import argparse
+import datetime
+import hashlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import zipfile
+
+import numpy as np
+
+FORMAT = "uvbf-sentiment-bundle"
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+VOCAB_BLOB_FILE = "vocab_blob.bin"
+ARRAYS = ("idf", "coef", "intercept", "vocab_offsets")
+FILES = (VOCAB_BLOB_FILE,) + tuple(f"{name}.npy" for name in ARRAYS)
+
+
+class BundleError(ValueError):
+    """Bundle illisible, corrompu ou d'une version non supportée"""
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _npy_bytes(array):
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+
+class Bundle:
+    """Contenu d'un bundle : manifeste, vocabulaire et tableaux"""
+
+    def __init__(self, manifest, terms, arrays):
+        self.manifest = manifest
+        self.terms = terms
+        self.idf = arrays['idf']
+        self.coef = arrays['coef']
+        self.intercept = arrays['intercept']
+        self.vocab_offsets = arrays['vocab_offsets']
+
+    @property
+    def labels(self):
+        return self.manifest['labels']
+
+    @property
+    def kind(self):
+        return self.manifest['kind']
+
+    @property
+    def analyzer(self):
+        return self.manifest['analyzer']
+
+    @property
+    def preprocessing(self):
+        return self.manifest['preprocessing']
+
+
+def write_bundle(path, terms, idf, coef, intercept, labels, kind, analyzer,
+                 preprocessing=None, model=None, versions=None):
+    """
+    Écrit un bundle dans le répertoire path (ou l'archive path si elle finit
+    par .zip). Retourne le manifeste.
+    """
+    blob = '\n'.join(terms).encode('utf-8')
+    lengths = [len(term.encode('utf-8')) + 1 for term in terms]
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    arrays = {
+        'idf': np.asarray(idf, dtype=np.float64),
+        'coef': np.asarray(coef, dtype=np.float64),
+        'intercept': np.asarray(intercept, dtype=np.float64).ravel(),
+        'vocab_offsets': offsets,
+    }
+    if arrays['coef'].shape != (len(terms), len(arrays['intercept'])):
+        raise BundleError(f"coef de forme {arrays['coef'].shape}, attendu "
+                          f"({len(terms)}, {len(arrays['intercept'])})")
+
+    files = {VOCAB_BLOB_FILE: blob}
+    files.update({f"{name}.npy": _npy_bytes(array) for name, array in arrays.items()})
+
+    manifest = {
+        'format': FORMAT,
+        'format_version': FORMAT_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'versions': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            **(versions or {}),
+        },
+        'model': model,
+        'kind': kind,
+        'labels': list(labels),
+        'n_features': len(terms),
+        'analyzer': analyzer,
+        'preprocessing': preprocessing or {},
+        'files': {
+            name: {'sha256': _sha256(data), 'bytes': len(data),
+                   **({'dtype': str(arrays[name[:-4]].dtype),
+                       'shape': list(arrays[name[:-4]].shape)} if name.endswith('.npy') else {})}
+            for name, data in files.items()
+        },
+    }
+    manifest_bytes = json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')
+
+    if path.endswith('.zip'):
+        # Non compressé : les membres se lisent sans décompression
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for name, data in files.items():
+                archive.writestr(name, data)
+            archive.writestr(MANIFEST_FILE, manifest_bytes)
+    else:
+        os.makedirs(path, exist_ok=True)
+        for name, data in files.items():
+            with open(os.path.join(path, name), 'wb') as f:
+                f.write(data)
+        # Le manifeste en dernier : un bundle sans manifeste est incomplet
+        with open(os.path.join(path, MANIFEST_FILE), 'wb') as f:
+            f.write(manifest_bytes)
+    return manifest
+
+
+def _check_manifest(manifest):
+    if manifest.get('format') != FORMAT:
+        raise BundleError(f"Format inconnu: {manifest.get('format')!r}")
+    version = manifest.get('format_version')
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise BundleError(f"Version de format {version!r} non supportée "
+                          f"(maximum {FORMAT_VERSION})")
+    # Seuls les fichiers attendus sont lus (pas de chemin arbitraire venant du manifeste)
+    if set(manifest.get('files', ())) != set(FILES):
+        raise BundleError(f"Fichiers du manifeste inattendus: {sorted(manifest.get('files', ()))}")
+
+
+def read_bundle(path, mmap=True, verify=True):
+    """
+    Charge un bundle. Les tableaux d'un répertoire sont mmappés si mmap=True ;
+    ceux d'une archive .zip sont lus en mémoire. verify=True contrôle les
+    sha256 du manifeste.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            manifest = json.loads(archive.read(MANIFEST_FILE))
+            _check_manifest(manifest)
+            raw = {name: archive.read(name) for name in FILES}
+        if verify:
+            _verify(manifest, raw.__getitem__)
+        arrays = {name: np.load(io.BytesIO(raw[f"{name}.npy"]), allow_pickle=False)
+                  for name in ARRAYS}
+        blob = raw[VOCAB_BLOB_FILE]
+    else:
+        with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        _check_manifest(manifest)
+        if verify:
+            def read(name):
+                with open(os.path.join(path, name), 'rb') as f:
+                    return f.read()
+            _verify(manifest, read)
+        mode = 'r' if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode,
+                                allow_pickle=False)
+                  for name in ARRAYS}
+        with open(os.path.join(path, VOCAB_BLOB_FILE), 'rb') as f:
+            blob = f.read()
+
+    terms = _split_vocab(blob, arrays['vocab_offsets'])
+    if len(terms) != manifest['n_features']:
+        raise BundleError("Vocabulaire incohérent avec le manifeste")
+    return Bundle(manifest, terms, arrays)
+
+
+def _split_vocab(blob, offsets):
+    """Termes du blob découpés avec vocab_offsets (séparateurs contrôlés)"""
+    offsets = np.asarray(offsets)
+    n = len(offsets) - 1
+    if n < 0 or offsets[0] != 0 or (n and offsets[-1] != len(blob) + 1) or (not n and blob):
+        raise BundleError("vocab_offsets incohérent avec vocab_blob.bin")
+    if n and (np.diff(offsets) < 1).any():
+        raise BundleError("vocab_offsets non croissant")
+    bounds = offsets.tolist()
+    if any(blob[end - 1:end] != b'\n' for end in bounds[1:-1]):
+        raise BundleError("Séparateur manquant dans vocab_blob.bin")
+    return [blob[start:end - 1].decode('utf-8') for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _verify(manifest, read):
+    for name in FILES:
+        if _sha256(read(name)) != manifest['files'][name]['sha256']:
+            raise BundleError(f"sha256 invalide pour {name}")
+
+
+def convert_pickles(vectorizer_path, model_path, output, clean=False):
+    """
+    Convertit tfidf_vectorizer.pkl + best_sentiment_model.pkl en bundle.
+    clean : le modèle attend un texte passé par clean_tweet (le vectoriseur du
+    notebook est entraîné sur le texte brut de 'Tweet', d'où False par défaut)
+    """
+    import pickle
+
+    from linear_scorer import export_linear
+
+    with open(vectorizer_path, 'rb') as f:
+        vectorizer = pickle.load(f)
+    with open(model_path, 'rb') as f:
+        bundle = pickle.load(f)
+    return export_linear(vectorizer, bundle['model'], bundle['encoder'], output,
+                         name=bundle.get('name'), clean=clean)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundles de modèle sans pickle")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    convert = sub.add_parser('convert', help='Convertir les pickles du notebook en bundle')
+    convert.add_argument('--vectorizer', default='tfidf_vectorizer.pkl')
+    convert.add_argument('--model', default='best_sentiment_model.pkl')
+    convert.add_argument('--output', default='sentiment_model',
+                         help='Répertoire du bundle (ou archive .zip)')
+    convert.add_argument('--clean', action='store_true',
+                         help="Le modèle attend un texte passé par clean_tweet (défaut : texte brut)")
+
+    info = sub.add_parser('info', help='Afficher le manifeste et le temps de chargement')
+    info.add_argument('path')
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        manifest = convert_pickles(args.vectorizer, args.model, args.output,
+                                   clean=args.clean)
+        print(f"Bundle écrit dans {args.output}: {manifest['model']['name']}, "
+              f"{manifest['n_features']} termes, classes {manifest['labels']}")
+    else:
+        start = time.perf_counter()
+        bundle = read_bundle(args.path)
+        elapsed = (time.perf_counter() - start) * 1000
+        json.dump({k: v for k, v in bundle.manifest.items() if k != 'files'},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        print(f"\nChargé et vérifié en {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
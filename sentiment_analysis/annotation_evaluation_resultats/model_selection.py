@@ -0,0 +1,154 @@
+"""
+Sélection de modèles en parallèle : Naive Bayes, régression logistique, SVM.
+
+Chaque couple (modèle, hyperparamètres, fold) est une tâche joblib
+indépendante. Les workers rouvrent eux-mêmes la matrice TF-IDF depuis le
+store mmappé de vectorization/sparse_store.py : la matrice est partagée par le
+cache de pages du système au lieu d'être copiée dans chaque processus. Les
+temps de fit et de predict sont mesurés à côté de l'accuracy et du F1.
+
+Pour les gros corpus, large_corpus=True remplace SVC(kernel='linear'), dont
+le coût croît plus vite que linéairement avec le nombre de tweets, par
+LinearSVC (ou SGDClassifier avec svm='sgd').
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import SVC, LinearSVC
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'vectorization'))
+from sparse_store import open_csr  # noqa: E402
+
+
+def default_candidates(large_corpus=False, svm='linearsvc'):
+    """Modèles candidats et leurs grilles d'hyperparamètres"""
+    candidates = {
+        'Naive Bayes': (MultinomialNB(), {'alpha': [0.1, 0.5, 1.0]}),
+        'Logistic Regression': (LogisticRegression(max_iter=1000, random_state=42),
+                                {'C': [0.1, 1.0, 10.0]}),
+    }
+    if not large_corpus:
+        candidates['SVM'] = (SVC(kernel='linear', random_state=42), {'C': [0.1, 1.0, 10.0]})
+    elif svm == 'sgd':
+        candidates['SVM'] = (SGDClassifier(loss='hinge', random_state=42),
+                             {'alpha': [1e-5, 1e-4, 1e-3]})
+    else:
+        candidates['SVM'] = (LinearSVC(random_state=42), {'C': [0.1, 1.0, 10.0]})
+    return candidates
+
+
+def _fit_score(store_dir, estimator, params, y, train_idx, test_idx):
+    """Une tâche : fit sur train_idx, predict sur test_idx, avec les temps"""
+    store = open_csr(store_dir)
+    X_train, X_test = store.rows(train_idx), store.rows(test_idx)
+
+    model = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    model.fit(X_train, y[train_idx])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+
+    y_true = y[test_idx]
+    return {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'f1_macro': f1_score(y_true, y_pred, average='macro'),
+        'fit_time': fit_time,
+        'predict_time': predict_time,
+        'model': model,
+        'predictions': y_pred,
+    }
+
+
+def cross_validate_grid(store_dir, y, train_idx, candidates=None, cv=5, n_jobs=-1,
+                        random_state=42):
+    """
+    Validation croisée de toutes les grilles en parallèle sur les lignes train_idx.
+    Retourne un DataFrame (une ligne par modèle / hyperparamètres).
+    """
+    candidates = candidates or default_candidates()
+    y = np.asarray(y)
+    train_idx = np.asarray(train_idx)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state)
+                 .split(train_idx, y[train_idx]))
+
+    tasks = []
+    for name, (estimator, grid) in candidates.items():
+        for params in ParameterGrid(grid):
+            for fold, (tr, va) in enumerate(folds):
+                # Index triés : lecture séquentielle du store
+                tasks.append((name, params, fold,
+                              np.sort(train_idx[tr]), np.sort(train_idx[va]), estimator))
+
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_score)(store_dir, estimator, params, y, tr, va)
+        for _, params, _, tr, va, estimator in tasks
+    )
+
+    rows = [
+        {'model': name, 'params': params, 'fold': fold,
+         **{k: out[k] for k in ('accuracy', 'f1_macro', 'fit_time', 'predict_time')}}
+        for (name, params, fold, *_), out in zip(tasks, outputs)
+    ]
+    cv_results = pd.DataFrame(rows)
+    cv_results['params_key'] = cv_results['params'].map(lambda p: repr(sorted(p.items())))
+    summary = (cv_results
+               .groupby(['model', 'params_key'], sort=False)
+               .agg(params=('params', 'first'),
+                    accuracy=('accuracy', 'mean'),
+                    accuracy_std=('accuracy', 'std'),
+                    f1_macro=('f1_macro', 'mean'),
+                    fit_time=('fit_time', 'mean'),
+                    predict_time=('predict_time', 'mean'))
+               .reset_index()
+               .drop(columns='params_key'))
+    return summary
+
+
+def best_params(summary, scoring='accuracy'):
+    """Meilleurs hyperparamètres de chaque modèle"""
+    best = summary.loc[summary.groupby('model', sort=False)[scoring].idxmax()]
+    return dict(zip(best['model'], best['params']))
+
+
+def fit_and_evaluate(store_dir, y, train_idx, test_idx, params_by_model, candidates=None,
+                     n_jobs=-1):
+    """
+    Entraîne chaque modèle avec ses meilleurs hyperparamètres sur train_idx, en
+    parallèle, et l'évalue sur test_idx. Retourne (models, results) comme le
+    notebook : results[nom] = {'accuracy', 'f1_macro', 'fit_time',
+    'predict_time', 'predictions'}.
+    """
+    candidates = candidates or default_candidates()
+    y = np.asarray(y)
+    names = list(params_by_model)
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_score)(store_dir, candidates[name][0], params_by_model[name], y,
+                            np.asarray(train_idx), np.asarray(test_idx))
+        for name in names
+    )
+    models = {name: out.pop('model') for name, out in zip(names, outputs)}
+    results = dict(zip(names, outputs))
+    return models, results
+
+
+def select_models(store_dir, y, train_idx, test_idx, cv=5, n_jobs=-1, large_corpus=False,
+                  svm='linearsvc', scoring='accuracy'):
+    """Validation croisée des grilles puis entraînement final des meilleurs réglages"""
+    candidates = default_candidates(large_corpus=large_corpus, svm=svm)
+    summary = cross_validate_grid(store_dir, y, train_idx, candidates, cv=cv, n_jobs=n_jobs)
+    params = best_params(summary, scoring=scoring)
+    models, results = fit_and_evaluate(store_dir, y, train_idx, test_idx, params,
+                                       candidates, n_jobs=n_jobs)
+    return summary, models, results
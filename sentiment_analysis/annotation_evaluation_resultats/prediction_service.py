@@ -0,0 +1,366 @@
+"""
+Service de prédiction local pour best_sentiment_model.pkl.
+
+Le vectoriseur et le modèle sont chargés une seule fois au démarrage. Les
+requêtes concurrentes sont regroupées en micro-lots (au plus max_batch textes
+ou max_wait_ms d'attente) : un seul transform + predict par lot au lieu d'un
+par requête. Le vectoriseur du pipeline est entraîné sur le texte brut de
+'Tweet' : les textes lui sont passés tels quels, --clean applique d'abord le
+nettoyage de TweetPreprocessor (prétraitement/cleaning.py) pour un modèle
+entraîné sur le texte nettoyé. Avec --bundle, le manifeste décide.
+Le serveur parle HTTP/1.1 : un client garde sa connexion d'une requête à
+l'autre (keep-alive).
+
+    python prediction_service.py --vectorizer tfidf_vectorizer.pkl --model best_sentiment_model.pkl
+    python prediction_service.py --unix /tmp/sentiment.sock
+    python prediction_service.py --bundle sentiment_model   # sans pickle (model_bundle.py)
+
+    POST /predict   {"texts": ["...", "..."]}
+                    -> {"predictions": [{"label": "positif", "probabilities": {...}}, ...]}
+    GET  /metrics   latences p50 / p99, taille moyenne des lots
+    GET  /health
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import queue
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'prétraitement'))
+from cleaning import clean_tweet  # noqa: E402
+from linear_scorer import LinearScorer  # noqa: E402
+from model_bundle import read_bundle  # noqa: E402
+
+logger = logging.getLogger("prediction_service")
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    np.exp(scores, out=scores)
+    return scores / scores.sum(axis=1, keepdims=True)
+
+
+class SentimentModel:
+    """Vectoriseur + modèle + LabelEncoder, chargés une fois"""
+
+    def __init__(self, vectorizer, model, encoder, name=None, clean=False):
+        self.vectorizer = vectorizer
+        self.model = model
+        self.encoder = encoder
+        self.name = name or type(model).__name__
+        self.clean = clean
+        self.classes = [str(c) for c in encoder.inverse_transform(model.classes_)]
+
+    @classmethod
+    def from_pickles(cls, vectorizer_path, model_path, clean=False):
+        with open(vectorizer_path, 'rb') as f:
+            vectorizer = pickle.load(f)
+        with open(model_path, 'rb') as f:
+            bundle = pickle.load(f)
+        return cls(vectorizer, bundle['model'], bundle['encoder'], bundle.get('name'), clean)
+
+    def probabilities(self, X):
+        """
+        predict_proba si le modèle l'expose ; sinon (SVC sans probability=True,
+        LinearSVC) softmax de decision_function, qui donne le même argmax
+        """
+        if hasattr(self.model, 'predict_proba'):
+            return self.model.predict_proba(X)
+        scores = np.asarray(self.model.decision_function(X), dtype=np.float64)
+        if scores.ndim == 1:
+            scores = np.column_stack([-scores, scores])
+        return _softmax(scores)
+
+    def predict(self, texts):
+        """Libellés et probabilités par classe pour une liste de textes"""
+        if self.clean:
+            texts = [clean_tweet(t) for t in texts]
+        X = self.vectorizer.transform(texts)
+        labels = self.encoder.inverse_transform(self.model.predict(X))
+        proba = self.probabilities(X)
+        return [
+            {'label': str(label), 'probabilities': dict(zip(self.classes, map(float, row)))}
+            for label, row in zip(labels, proba)
+        ]
+
+
+class BundleSentimentModel:
+    """Même interface que SentimentModel, à partir d'un bundle sans pickle (model_bundle.py)"""
+
+    def __init__(self, scorer, name, clean=False):
+        self.scorer = scorer
+        self.name = name
+        self.clean = clean
+        self.classes = [str(c) for c in scorer.labels]
+
+    @classmethod
+    def from_bundle(cls, path, clean=None):
+        bundle = read_bundle(path)
+        if clean is None:
+            clean = bundle.preprocessing.get('clean_tweet', False)
+        return cls(LinearScorer.from_bundle(bundle), bundle.manifest['model']['name'], clean)
+
+    def predict(self, texts):
+        if self.clean:
+            texts = [clean_tweet(t) for t in texts]
+        labels, proba = self.scorer.predict_with_proba(texts)
+        return [
+            {'label': str(label), 'probabilities': dict(zip(self.classes, map(float, row)))}
+            for label, row in zip(labels, proba)
+        ]
+
+
+class LatencyStats:
+    """Latences des dernières requêtes (fenêtre glissante) et tailles de lots"""
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.texts = 0
+        self.lock = threading.Lock()
+
+    def record_request(self, seconds, n_texts):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.requests += 1
+            self.texts += n_texts
+
+    def record_batch(self, n_texts):
+        with self.lock:
+            self.batch_sizes.append(n_texts)
+
+    def snapshot(self):
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            batch_sizes = np.array(self.batch_sizes)
+            requests, texts = self.requests, self.texts
+        result = {'requests': requests, 'texts': texts, 'batches': int(len(batch_sizes))}
+        if len(latencies):
+            p50, p99 = np.percentile(latencies, [50, 99])
+            result.update(p50_ms=round(float(p50), 3), p99_ms=round(float(p99), 3),
+                          mean_ms=round(float(latencies.mean()), 3))
+        if len(batch_sizes):
+            result['mean_batch_size'] = round(float(batch_sizes.mean()), 2)
+        return result
+
+
+class MicroBatcher:
+    """
+    Regroupe les requêtes concurrentes : un thread unique vide la file jusqu'à
+    max_batch textes ou max_wait_ms après la première requête, prédit le lot
+    entier et redistribue les résultats.
+    """
+
+    def __init__(self, model, max_batch=256, max_wait_ms=5.0, stats=None):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.stats = stats or LatencyStats()
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, texts):
+        future = Future()
+        self.pending.put((list(texts), future))
+        return future
+
+    def predict(self, texts, timeout=None):
+        return self.submit(texts).result(timeout)
+
+    def _collect(self):
+        items = [self.pending.get()]
+        size = len(items[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self.pending.get(timeout=remaining)
+            except queue.Empty:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            texts = [t for batch, _ in items for t in batch]
+            try:
+                predictions = self.model.predict(texts) if texts else []
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self.stats.record_batch(len(texts))
+            start = 0
+            for batch, future in items:
+                future.set_result(predictions[start:start + len(batch)])
+                start += len(batch)
+
+
+def parse_texts(payload):
+    """Textes d'une requête {"texts": [...]} ; ValueError si elle est mal formée"""
+    if not isinstance(payload, dict):
+        raise ValueError("le corps doit être un objet JSON {\"texts\": [...]}")
+    if 'texts' not in payload:
+        raise ValueError("champ 'texts' manquant")
+    texts = payload['texts']
+    if isinstance(texts, str):
+        texts = [texts]
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        raise ValueError("'texts' doit être une chaîne ou une liste de chaînes")
+    return texts
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    server_version = "SentimentService/1.0"
+    # Connexions persistantes : chaque réponse porte un Content-Length
+    protocol_version = 'HTTP/1.1'
+    # wfile tamponné : en-têtes et corps partent en un seul envoi, vidé par
+    # handle_one_request. En deux envois, le second attendait l'ACK retardé du
+    # client (algorithme de Nagle, ~40 ms par réponse en keep-alive)
+    wbufsize = -1
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'model': self.server.model.name})
+        elif self.path == '/metrics':
+            self._send_json(200, self.server.stats.snapshot())
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            self.close_connection = True
+            self._send_json(400, {'error': "requête invalide: Content-Length"})
+            return
+        # Corps lu avant toute réponse, pour que la connexion reste utilisable
+        body = self.rfile.read(length)
+        if self.path != '/predict':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            texts = parse_texts(json.loads(body or b'{}'))
+        except ValueError as e:
+            self._send_json(400, {'error': f"requête invalide: {e}"})
+            return
+
+        try:
+            predictions = self.server.batcher.predict(texts, timeout=self.server.timeout_s)
+        except Exception as e:
+            logger.exception("Échec de la prédiction")
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, {'predictions': predictions})
+        self.server.stats.record_request(time.perf_counter() - start, len(texts))
+
+    def address_string(self):
+        # client_address est vide sur une socket Unix
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _ServiceMixin:
+    daemon_threads = True
+
+    def attach(self, model, batcher, timeout_s):
+        self.model = model
+        self.batcher = batcher
+        self.stats = batcher.stats
+        self.timeout_s = timeout_s
+        return self
+
+
+class HTTPService(_ServiceMixin, ThreadingHTTPServer):
+    pass
+
+
+class UnixService(_ServiceMixin, socketserver.ThreadingUnixStreamServer):
+    pass
+
+
+def make_server(model, host='127.0.0.1', port=8000, unix_socket=None, max_batch=256,
+                max_wait_ms=5.0, timeout_s=30.0):
+    """Serveur HTTP (TCP ou socket Unix) prêt pour serve_forever()"""
+    batcher = MicroBatcher(model, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)
+        server = UnixService(unix_socket, PredictionHandler)
+    else:
+        server = HTTPService((host, port), PredictionHandler)
+    return server.attach(model, batcher, timeout_s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service de prédiction de sentiment")
+    parser.add_argument('--vectorizer', default='tfidf_vectorizer.pkl', help='Vectoriseur TF-IDF')
+    parser.add_argument('--model', default='best_sentiment_model.pkl',
+                        help="Pickle {'model', 'encoder', 'name'} du notebook")
+    parser.add_argument('--bundle', help='Bundle sans pickle (remplace --vectorizer / --model)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--unix', help='Écouter sur une socket Unix au lieu de TCP')
+    parser.add_argument('--max-batch', type=int, default=256, help='Textes max par micro-lot')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="Attente max pour remplir un micro-lot")
+    parser.add_argument('--clean', action=argparse.BooleanOptionalAction, default=None,
+                        help="Appliquer clean_tweet avant la vectorisation (défaut : non, le "
+                             "vectoriseur est entraîné sur le texte brut ; avec --bundle, le "
+                             "manifeste décide)")
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    start = time.perf_counter()
+    if args.bundle:
+        model = BundleSentimentModel.from_bundle(args.bundle, clean=args.clean)
+    else:
+        model = SentimentModel.from_pickles(args.vectorizer, args.model, clean=bool(args.clean))
+    logger.info("Modèle %s chargé en %.0f ms (classes: %s)", model.name,
+                (time.perf_counter() - start) * 1000, ', '.join(model.classes))
+
+    server = make_server(model, args.host, args.port, args.unix, args.max_batch, args.max_wait_ms)
+    logger.info("Écoute sur %s", args.unix or f"http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+        logger.info("Métriques: %s", server.stats.snapshot())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+"""
+Exécution de bout en bout : fusion -> langue -> nettoyage -> quasi-doublons ->
+(vectorisation, annotation) -> entraînement.
+
+Chaque étape est une fonction avec des entrées et des sorties déclarées, à
+leur place canonique : une étape lit directement les fichiers produits par la
+précédente au lieu de copies faites à la main entre répertoires. Une étape est
+sautée quand le hash de ses entrées (contenu des fichiers, paramètres, code
+de la fonction et des modules du projet qu'elle importe) n'a pas changé et
+que ses sorties sont intactes. Les étapes indépendantes (vectorisation et
+annotation) tournent en parallèle dans des processus séparés.
+
+    python pipeline.py run                       # ne recalcule que ce qui a changé
+    python pipeline.py run --force clean         # relancer une étape (et la suite si ses sorties changent)
+    python pipeline.py run vectorize annotate    # seulement ces étapes
+    python pipeline.py status
+"""
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIRECTORIES = ('scrapping', 'prétraitement', 'vectorization', 'annotation_evaluation_resultats')
+for _directory in SOURCE_DIRECTORIES:
+    sys.path.append(os.path.join(ROOT, _directory))
+
+from storage import read_dataset, write_dataset  # noqa: E402
+
+STATE_FILE = os.path.join(ROOT, "pipeline_state.json")
+
+# Colonnes retirées avant le prétraitement (Netoyage.ipynb)
+DROPPED_COLUMNS = ['Link', 'Images', 'Retweets', 'Replies', 'Likes', 'langue',
+                   'Unnamed: 3', 'Unnamed: 4']
+
+# Paramètres du vectoriseur de vectorisation.ipynb
+TFIDF_PARAMS = {
+    'max_features': 5000,
+    'min_df': 3,
+    'max_df': 0.8,
+    'ngram_range': (1, 2),
+    'sublinear_tf': True,
+    'strip_accents': 'unicode',
+    'lowercase': True,
+    'analyzer': 'word',
+}
+
+
+# -- étapes ------------------------------------------------------------------
+#
+# Signature commune : (inputs, outputs, params) -> nombre de lignes produites.
+# Les imports lourds restent dans les fonctions : seules les étapes exécutées
+# chargent spaCy ou scikit-learn.
+
+def stage_merge(inputs, outputs, params):
+    """Fusion dédupliquée des CSV scrappés et de l'archive uvb_all.csv (fusioner.py)"""
+    from fusioner import merge
+    # Sortie reconstruite à chaque passage : uvb_all.csv, seule copie de
+    # tweets plus anciens, est une entrée et n'est jamais réécrit
+    return merge(inputs, outputs[0], chunksize=params['chunksize'], append=False)['written']
+
+
+def stage_langue(inputs, outputs, params):
+    """Garde les tweets en français (langue.py)"""
+    from langue import filter_french, get_backend
+    df = filter_french(read_dataset(inputs[0]), backend=get_backend(params['backend']))
+    write_dataset(df, outputs[0])
+    return len(df)
+
+
+def stage_clean(inputs, outputs, params):
+    """Nettoyage, tokenisation et lemmatisation (preprocessor.py), tweets vides retirés"""
+    from cache import PreprocessingCache
+    from preprocessor import TweetPreprocessor, load_nlp
+
+    df = read_dataset(inputs[0])
+    df = df.drop(columns=[c for c in DROPPED_COLUMNS if c in df])
+    cache = PreprocessingCache(os.path.join(ROOT, params['cache']))
+    try:
+        preprocessor = TweetPreprocessor(nlp=load_nlp(), batch_size=params['batch_size'],
+                                         n_process=params['n_process'], cache=cache)
+        df = preprocessor.preprocess_dataframe(df, column='Tweet')
+    finally:
+        cache.close()
+    df = df[df['text_final'].str.len() > 0]
+    write_dataset(df, outputs[0])
+    return len(df)
+
+
+def stage_dedup(inputs, outputs, params):
+    """Un seul représentant par groupe de quasi-doublons (near_duplicates.py)"""
+    from near_duplicates import drop_near_duplicates
+
+    df = read_dataset(inputs[0])
+    df, _ = drop_near_duplicates(df, column=params['column'], num_perm=params['num_perm'],
+                                 bands=params['bands'], k=params['shingle_size'],
+                                 threshold=params['threshold'])
+    write_dataset(df, outputs[0])
+    return len(df)
+
+
+def stage_vectorize(inputs, outputs, params):
+    """TF-IDF : store CSR mmappé (sparse_store.py) et vectoriseur pickle"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sparse_store import save_csr
+
+    df = read_dataset(inputs[0], columns=['Tweet'])
+    vectorizer = TfidfVectorizer(**params['tfidf'])
+    X_tfidf = vectorizer.fit_transform(df['Tweet'].fillna('').astype(str))
+    save_csr(X_tfidf, outputs[0])
+    with open(outputs[1], 'wb') as f:
+        pickle.dump(vectorizer, f)
+    return X_tfidf.shape[0]
+
+
+def stage_annotate(inputs, outputs, params):
+    """Annotation semi-automatique par mots-clés (keyword_annotator.py)"""
+    from keyword_annotator import KeywordAnnotator
+
+    df = read_dataset(inputs[0])
+    df['sentiment'] = KeywordAnnotator().annotate(df['Tweet'])
+    write_dataset(df, outputs[0])
+    return len(df)
+
+
+def stage_train(inputs, outputs, params):
+    """Sélection de modèle (model_selection.py), pickle du meilleur et bundle sans pickle"""
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import LabelEncoder
+
+    from linear_scorer import export_linear
+    from model_selection import select_models
+    from sparse_store import open_csr
+
+    data_path, matrix_dir, vectorizer_path = inputs
+    df = read_dataset(data_path, columns=['sentiment'])
+    if open_csr(matrix_dir).shape[0] != len(df):
+        raise ValueError("Problème de correspondance entre matrice et labels")
+
+    le = LabelEncoder()
+    y = le.fit_transform(df['sentiment'])
+    idx_train, idx_test = train_test_split(np.arange(len(y)), test_size=0.2, random_state=42,
+                                           stratify=y)
+    _, models, results = select_models(matrix_dir, y, np.sort(idx_train), np.sort(idx_test),
+                                       cv=params['cv'], n_jobs=params['n_jobs'],
+                                       large_corpus=params['large_corpus'])
+    best_model_name = max(results, key=lambda k: results[k]['accuracy'])
+    best_model = models[best_model_name]
+    print(f"  Meilleur modèle: {best_model_name} "
+          f"({results[best_model_name]['accuracy'] * 100:.2f}%)")
+
+    with open(outputs[0], 'wb') as f:
+        pickle.dump({'model': best_model, 'encoder': le, 'name': best_model_name}, f)
+    with open(vectorizer_path, 'rb') as f:
+        vectorizer = pickle.load(f)
+    # Le vectoriseur est entraîné sur le texte brut de 'Tweet'
+    export_linear(vectorizer, best_model, le, outputs[1], name=best_model_name, clean=False)
+    return len(y)
+
+
+# -- déclaration du pipeline -------------------------------------------------
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable
+    inputs: List[str]
+    outputs: List[str]
+    params: Dict = field(default_factory=dict)
+    exclude: List[str] = field(default_factory=list)
+
+    def input_paths(self):
+        """Entrées avec les motifs glob développés, chemins absolus"""
+        paths = []
+        for pattern in self.inputs:
+            pattern = os.path.join(ROOT, pattern)
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            paths.extend(
+                path for path in matches
+                if not any(fnmatch.fnmatch(os.path.basename(path), pat)
+                           or fnmatch.fnmatch(os.path.relpath(path, ROOT), pat)
+                           for pat in self.exclude)
+                and path not in self.output_paths()
+            )
+        return paths
+
+    def output_paths(self):
+        return [os.path.join(ROOT, path) for path in self.outputs]
+
+
+STAGES = [
+    Stage('merge', stage_merge,
+          inputs=['prétraitement/uvb_all.csv', 'scrapping/*.csv'],
+          outputs=['prétraitement/uvb_merged.csv'],
+          params={'chunksize': 100_000},
+          # scrapping/uvb_all.csv : copie de prétraitement/uvb_all.csv
+          exclude=['uvbf_data.csv', 'scrapping/uvb_all.csv']),
+    Stage('langue', stage_langue,
+          inputs=['prétraitement/uvb_merged.csv'],
+          # data_francais.csv : référence langdetect de langue.py report, jamais réécrite
+          outputs=['prétraitement/data_fr_ngram.csv'],
+          params={'backend': 'ngram'}),
+    Stage('clean', stage_clean,
+          inputs=['prétraitement/data_fr_ngram.csv'],
+          outputs=['prétraitement/data_preprocessed.parquet'],
+          params={'cache': 'prétraitement/preprocessing_cache.sqlite',
+                  'batch_size': 1000, 'n_process': 2}),
+    Stage('dedup', stage_dedup,
+          inputs=['prétraitement/data_preprocessed.parquet'],
+          outputs=['prétraitement/data_dedup.parquet'],
+          params={'column': 'tweet_cleaned', 'num_perm': 128, 'bands': 32, 'shingle_size': 5,
+                  'threshold': 0.7}),
+    Stage('vectorize', stage_vectorize,
+          inputs=['prétraitement/data_dedup.parquet'],
+          outputs=['vectorization/tfidf_matrix', 'vectorization/tfidf_vectorizer.pkl'],
+          params={'tfidf': TFIDF_PARAMS}),
+    Stage('annotate', stage_annotate,
+          inputs=['prétraitement/data_dedup.parquet'],
+          outputs=['annotation_evaluation_resultats/data_with_sentiment.csv']),
+    Stage('train', stage_train,
+          inputs=['annotation_evaluation_resultats/data_with_sentiment.csv',
+                  'vectorization/tfidf_matrix', 'vectorization/tfidf_vectorizer.pkl'],
+          outputs=['annotation_evaluation_resultats/best_sentiment_model.pkl',
+                   'annotation_evaluation_resultats/sentiment_model'],
+          params={'cv': 5, 'n_jobs': -1, 'large_corpus': False}),
+]
+STAGES_BY_NAME = {stage.name: stage for stage in STAGES}
+
+
+def dependencies(stage, stages=STAGES):
+    """Étapes dont une sortie est une entrée de stage"""
+    wanted = set(stage.input_paths()) | {os.path.join(ROOT, p) for p in stage.inputs}
+    return [other.name for other in stages
+            if other is not stage and wanted & set(other.output_paths())]
+
+
+# -- hash du contenu -----------------------------------------------------------
+
+def _module_path(name):
+    """Fichier d'un module du projet (storage.py ou un des SOURCE_DIRECTORIES), None sinon"""
+    for directory in ('',) + SOURCE_DIRECTORIES:
+        path = os.path.join(ROOT, directory, name.split('.')[0] + '.py')
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _imported_names(tree):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+
+
+def local_modules(func):
+    """
+    Fichiers des modules du projet importés par func, directement ou par
+    ces modules eux-mêmes (imports analysés avec ast, sans rien exécuter)
+    """
+    found = []
+    todo = [ast.parse(inspect.getsource(func).strip())]
+    while todo:
+        for name in _imported_names(todo.pop()):
+            path = _module_path(name)
+            if path and path not in found:
+                found.append(path)
+                with open(path, encoding='utf-8') as f:
+                    todo.append(ast.parse(f.read()))
+    return sorted(found)
+
+
+class ContentHasher:
+    """sha256 des fichiers, mémorisé par (taille, mtime) pour ne pas relire l'inchangé"""
+
+    def __init__(self, memo=None):
+        self.memo = memo or {}
+
+    def file(self, path):
+        stat = os.stat(path)
+        key = os.path.relpath(path, ROOT)
+        cached = self.memo.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+        digest = h.hexdigest()
+        self.memo[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        return digest
+
+    def path(self, path):
+        """Hash d'un fichier ou d'un répertoire (tous ses fichiers), None s'il n'existe pas"""
+        if os.path.isdir(path):
+            h = hashlib.sha256()
+            for directory, _, files in sorted(os.walk(path)):
+                for name in sorted(files):
+                    full = os.path.join(directory, name)
+                    h.update(os.path.relpath(full, path).encode('utf-8'))
+                    h.update(self.file(full).encode('ascii'))
+            return h.hexdigest()
+        if os.path.isfile(path):
+            return self.file(path)
+        return None
+
+    def stage_key(self, stage):
+        """Hash des entrées, des paramètres, du code de l'étape et des modules du projet qu'elle importe"""
+        h = hashlib.sha256()
+        h.update(inspect.getsource(stage.func).encode('utf-8'))
+        # storage.py : importé au niveau du module, utilisé par les étapes
+        for path in sorted(set(local_modules(stage.func)) | {os.path.join(ROOT, 'storage.py')}):
+            h.update(os.path.relpath(path, ROOT).encode('utf-8'))
+            h.update(self.file(path).encode('ascii'))
+        h.update(json.dumps(stage.params, sort_keys=True, default=str).encode('utf-8'))
+        for path in stage.input_paths():
+            digest = self.path(path)
+            if digest is None:
+                raise FileNotFoundError(f"Entrée manquante pour '{stage.name}': "
+                                        f"{os.path.relpath(path, ROOT)}")
+            h.update(os.path.relpath(path, ROOT).encode('utf-8'))
+            h.update(digest.encode('ascii'))
+        return h.hexdigest()
+
+
+def load_state(path=STATE_FILE):
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    return {'stages': {}, 'files': {}}
+
+
+def save_state(state, path=STATE_FILE):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def is_up_to_date(stage, key, state, hasher):
+    """Même hash d'entrée qu'au dernier passage et sorties inchangées depuis"""
+    previous = state['stages'].get(stage.name)
+    if not previous or previous.get('key') != key:
+        return False
+    return all(hasher.path(path) == previous['outputs'].get(os.path.relpath(path, ROOT))
+               for path in stage.output_paths())
+
+
+# -- exécution -----------------------------------------------------------------
+
+def _execute(name):
+    """Point d'entrée des processus : exécute une étape et mesure sa durée"""
+    stage = STAGES_BY_NAME[name]
+    for path in stage.output_paths():
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    start = time.perf_counter()
+    rows = stage.func(stage.input_paths(), stage.output_paths(), stage.params)
+    return rows, time.perf_counter() - start
+
+
+def run(selected=None, force=(), jobs=2, dry_run=False):
+    """
+    Exécute les étapes selected (toutes par défaut) dans l'ordre des
+    dépendances ; une étape démarre dès que ses dépendances sont terminées.
+    """
+    stages = [s for s in STAGES if selected is None or s.name in selected]
+    names = {s.name for s in stages}
+    pending = {s.name: set(dependencies(s)) & names for s in stages}
+    state = load_state()
+    hasher = ContentHasher(state.get('files'))
+    report = {}
+
+    def record(name, status, rows=None, seconds=None):
+        report[name] = {'status': status, 'rows': rows, 'seconds': seconds}
+        print(f"[{name}] {status}" + (f" en {seconds:.1f} s, {rows} lignes" if seconds else ""))
+
+    def finish(name, rows, seconds):
+        stage = STAGES_BY_NAME[name]
+        state['stages'][name] = {
+            'key': running_keys.pop(name),
+            'outputs': {os.path.relpath(p, ROOT): hasher.path(p) for p in stage.output_paths()},
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'finished': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        state['files'] = hasher.memo
+        save_state(state)
+        record(name, 'exécutée', rows, seconds)
+
+    running_keys = {}
+    futures = {}
+    stale = set()      # --dry-run : étapes qui seraient exécutées
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or futures:
+            ready = [name for name, deps in pending.items() if not deps]
+            for name in ready:
+                del pending[name]
+                stage = STAGES_BY_NAME[name]
+                if dry_run and stale & set(dependencies(stage)):
+                    # Entrées pas encore produites : l'étape suivra celles qui changent
+                    stale.add(name)
+                    record(name, 'à exécuter')
+                    for deps in pending.values():
+                        deps.discard(name)
+                    continue
+                key = hasher.stage_key(stage)
+                if name not in force and is_up_to_date(stage, key, state, hasher):
+                    previous = state['stages'][name]
+                    record(name, 'inchangée')
+                    report[name]['rows'] = previous.get('rows')
+                    for deps in pending.values():
+                        deps.discard(name)
+                elif dry_run:
+                    stale.add(name)
+                    record(name, 'à exécuter')
+                    for deps in pending.values():
+                        deps.discard(name)
+                else:
+                    running_keys[name] = key
+                    futures[pool.submit(_execute, name)] = name
+                    print(f"[{name}] démarrée")
+
+            if not futures:
+                if pending and not any(not deps for deps in pending.values()):
+                    raise RuntimeError(f"Dépendances circulaires: {sorted(pending)}")
+                continue
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures.pop(future)
+                rows, seconds = future.result()
+                finish(name, rows, seconds)
+                for deps in pending.values():
+                    deps.discard(name)
+
+    print_report(report)
+    return report
+
+
+def print_report(report):
+    print(f"\n{'Étape':<12} {'Statut':<12} {'Durée':>10} {'Lignes':>10}")
+    for name, info in report.items():
+        seconds = f"{info['seconds']:.1f} s" if info['seconds'] else '-'
+        rows = f"{info['rows']:,}" if info['rows'] is not None else '-'
+        print(f"{name:<12} {info['status']:<12} {seconds:>10} {rows:>10}")
+
+
+def status():
+    state = load_state()
+    for stage in STAGES:
+        info = state['stages'].get(stage.name)
+        deps = ', '.join(dependencies(stage)) or '-'
+        if info:
+            print(f"{stage.name:<12} dépend de {deps:<20} dernier passage {info['finished']}, "
+                  f"{info['seconds']:.1f} s, {info['rows']} lignes")
+        else:
+            print(f"{stage.name:<12} dépend de {deps:<20} jamais exécutée")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline d'analyse de sentiment avec cache par étape")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = sub.add_parser('run', help='Exécuter les étapes dont les entrées ont changé')
+    run_parser.add_argument('stages', nargs='*',
+                            help=f"Étapes à considérer parmi {', '.join(STAGES_BY_NAME)} (toutes par défaut)")
+    run_parser.add_argument('--force', nargs='*', default=[], choices=list(STAGES_BY_NAME),
+                            help='Relancer ces étapes même si rien n\'a changé')
+    run_parser.add_argument('-j', '--jobs', type=int, default=2,
+                            help='Étapes exécutées en parallèle (défaut: 2)')
+    run_parser.add_argument('-n', '--dry-run', action='store_true',
+                            help='Afficher ce qui serait exécuté')
+    sub.add_parser('status', help='État du dernier passage de chaque étape')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        unknown = set(args.stages) - set(STAGES_BY_NAME)
+        if unknown:
+            parser.error(f"Étapes inconnues: {', '.join(sorted(unknown))}")
+        run(args.stages or None, force=set(args.force), jobs=args.jobs, dry_run=args.dry_run)
+    else:
+        status()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark du nettoyage : ancien clean_tweet (re.sub ligne par ligne) contre
+cleaning.clean_tweet (regex précompilées) et cleaning.clean_series (vectorisé).
+
+Vérifie aussi que les trois sorties sont identiques octet pour octet.
+
+    python bench_cleaning.py --csv ../vectorization/data_cleaned.csv --repeat 50
+"""
+import argparse
+import re
+import time
+
+import pandas as pd
+
+from cleaning import clean_series, clean_tweet
+
+
+def reference_clean_tweet(text):
+    """Copie de l'ancien TweetPreprocessor.clean_tweet (référence)"""
+    if pd.isna(text):
+        return ""
+
+    text = str(text)
+    text = re.sub(r'^RT @\w+:', '', text)
+    text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'www\.(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#(\w+)', r'\1', text)
+    emoji_pattern = re.compile("["
+                             u"\U0001F600-\U0001F64F"
+                             u"\U0001F300-\U0001F5FF"
+                             u"\U0001F680-\U0001F6FF"
+                             u"\U0001F1E0-\U0001F1FF"
+                             u"\U00002702-\U000027B0"
+                             u"\U000024C2-\U0001F251"
+                             "]+", flags=re.UNICODE)
+    text = emoji_pattern.sub(r' ', text)
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = re.sub(r'\b\d+\b', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def timed(label, func, n_rows):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f} s  {n_rows / elapsed:12,.0f} tweets/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du nettoyage des tweets")
+    parser.add_argument('--csv', default='data_cleaned.csv', help='Fichier CSV source')
+    parser.add_argument('--column', default='Tweet', help='Colonne texte (défaut: Tweet)')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Répéter le corpus N fois pour simuler un gros volume')
+    args = parser.parse_args()
+
+    tweets = pd.read_csv(args.csv)[args.column]
+    tweets = pd.concat([tweets] * args.repeat, ignore_index=True)
+    n_rows = len(tweets)
+    print(f"{n_rows} tweets ({args.csv} x{args.repeat})\n")
+
+    expected, t_ref = timed("référence (apply)", lambda: tweets.apply(reference_clean_tweet), n_rows)
+    compiled, t_compiled = timed("précompilé (apply)", lambda: tweets.apply(clean_tweet), n_rows)
+    vectorized, t_vec = timed("vectorisé (clean_series)", lambda: clean_series(tweets), n_rows)
+
+    print(f"\nAccélération précompilé: x{t_ref / t_compiled:.1f}")
+    print(f"Accélération vectorisé:  x{t_ref / t_vec:.1f}")
+
+    for label, result in (("précompilé", compiled), ("vectorisé", vectorized)):
+        diff = [i for i, (a, b) in enumerate(zip(expected, result)) if a.encode() != b.encode()]
+        if diff:
+            i = diff[0]
+            raise SystemExit(f"{label}: {len(diff)} sorties différentes, ex. ligne {i}: "
+                             f"{expected[i]!r} != {result[i]!r}")
+        print(f"{label}: sortie identique octet pour octet ({n_rows} tweets)")
+
+
+if __name__ == "__main__":
+    main()
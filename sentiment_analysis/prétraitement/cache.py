@@ -0,0 +1,112 @@
+"""
+Cache persistant (SQLite) des tokens produits par TweetPreprocessor.
+
+La clé est un hash du tweet nettoyé et de la configuration du preprocessor
+(stop words, modèle spaCy et sa version, filtre POS) : un changement de
+configuration invalide donc automatiquement toutes les anciennes entrées.
+Le cache est borné en nombre d'entrées, les moins récemment utilisées sont
+supprimées en premier.
+"""
+import hashlib
+import json
+import sqlite3
+import time
+
+# Limite du nombre de paramètres d'une requête SQLite
+_SQL_CHUNK = 500
+
+
+def hash_text(text, config_key):
+    """Hash d'un tweet pour une configuration donnée"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(config_key.encode('utf-8'))
+    h.update(b'\0')
+    h.update(str(text).encode('utf-8'))
+    return h.hexdigest()
+
+
+class PreprocessingCache:
+    def __init__(self, path="preprocessing_cache.sqlite", max_entries=1_000_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            " key TEXT PRIMARY KEY,"
+            " tokens TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON tokens(last_used)")
+        self.conn.commit()
+
+    def get_many(self, keys):
+        """Retourne {clé: tokens} pour les clés présentes et met à jour leur date d'usage"""
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for i in range(0, len(unique), _SQL_CHUNK):
+            chunk = unique[i:i + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, tokens FROM tokens WHERE key IN ({placeholders})", chunk
+            )
+            for key, tokens in rows:
+                found[key] = json.loads(tokens)
+
+        if found:
+            now = time.time()
+            self.conn.executemany("UPDATE tokens SET last_used = ? WHERE key = ?",
+                                  ((now, key) for key in found))
+            self.conn.commit()
+
+        hits = sum(1 for key in keys if key in found)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        return found
+
+    def put_many(self, items):
+        """Enregistre des paires (clé, tokens) puis applique la limite de taille"""
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO tokens (key, tokens, last_used) VALUES (?, ?, ?)",
+            ((key, json.dumps(tokens, ensure_ascii=False), now) for key, tokens in items)
+        )
+        self.conn.commit()
+        self.evict()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_entries"""
+        if not self.max_entries:
+            return 0
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            "DELETE FROM tokens WHERE key IN "
+            "(SELECT key FROM tokens ORDER BY last_used LIMIT ?)", (excess,)
+        )
+        self.conn.commit()
+        return excess
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self),
+        }
+
+    def clear(self):
+        self.conn.execute("DELETE FROM tokens")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,226 @@
+"""
+Détection des quasi-doublons par MinHash et LSH.
+
+La déduplication exacte (scrapers, fusioner.py) laisse passer les retweets,
+les posts repartagés et les tweets qui ne diffèrent que par une URL, une
+mention ou un emoji. Sur la sortie de clean_tweet (où ces différences ont
+déjà disparu), cette étape regroupe les textes presque identiques et ne garde
+qu'un représentant par groupe, le premier dans l'ordre du fichier.
+
+- chaque texte devient l'ensemble de ses shingles de caractères (k = 5 par
+  défaut), hachés en 64 bits avec pd.util.hash_array ; un texte plus court
+  que k est un seul shingle ;
+- la signature MinHash (num_perm minima de hachages multiply-shift) se
+  calcule par lots avec NumPy : un np.minimum.reduceat par permutation sur
+  tous les shingles du lot ;
+- LSH par bandes : deux textes sont candidats s'ils ont une bande identique.
+  Dans chaque bande, un tri des clés de bande suffit (aucune comparaison par
+  paires), puis chaque candidat n'est comparé qu'au premier texte de son
+  groupe : le coût reste en O(n log n) par bande ;
+- une paire candidate n'est gardée que si la similarité de Jaccard estimée
+  (part des minima égaux) atteint threshold ; les groupes sont les
+  composantes connexes des paires gardées.
+
+Avec num_perm = 128 et 32 bandes de 4 lignes, une paire de similarité 0,6
+est candidate avec une probabilité de 0,99, une paire à 0,4 avec 0,56 :
+le seuil final reste celui de la vérification.
+
+Sur data_cleaned.csv, une fois la colonne Tweet passée par clean_series
+(--clean), 78 des 555 tweets sont retirés (477 gardés).
+
+    python near_duplicates.py data_cleaned.csv --clean -o data_dedup.csv
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 128
+BANDS = 32
+SHINGLE_SIZE = 5
+THRESHOLD = 0.7
+
+# Shingles hachés par lot de signatures (borne la mémoire, environ
+# 8 octets x shingles du lot)
+_CHUNK_SIZE = 20_000
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Ensemble des sous-chaînes de k caractères du texte (le texte entier s'il est plus court)"""
+    if len(text) <= k:
+        return {text} if text else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def _permutations(num_perm, seed):
+    """Paramètres des hachages multiply-shift h(x) = (a * x + b) >> 32, a impair"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM, k=SHINGLE_SIZE, seed=42, chunk_size=_CHUNK_SIZE):
+    """
+    Signatures MinHash (n, num_perm) en uint32. Un texte vide a une signature
+    remplie de 2**32 - 1 et n'est jamais regroupé (voir lsh_clusters).
+    """
+    texts = ['' if pd.isna(text) else str(text) for text in texts]
+    a, b = _permutations(num_perm, seed)
+    empty = np.uint32(2 ** 32 - 1)
+    signatures = np.full((len(texts), num_perm), empty, dtype=np.uint32)
+    shift = np.uint64(32)
+
+    for start in range(0, len(texts), chunk_size):
+        sets = [shingles(text, k) for text in texts[start:start + chunk_size]]
+        sizes = np.fromiter((len(s) for s in sets), dtype=np.int64, count=len(sets))
+        rows = np.flatnonzero(sizes)
+        if not len(rows):
+            continue
+        values = np.array([shingle for s in sets for shingle in s], dtype=object)
+        hashes = pd.util.hash_array(values, categorize=False)
+        offsets = np.concatenate(([0], np.cumsum(sizes[rows])[:-1]))
+        block = np.empty((len(rows), num_perm), dtype=np.uint32)
+        with np.errstate(over='ignore'):
+            for j in range(num_perm):
+                permuted = ((a[j] * hashes + b[j]) >> shift).astype(np.uint32)
+                block[:, j] = np.minimum.reduceat(permuted, offsets)
+        signatures[start + rows] = block
+    return signatures
+
+
+def _band_keys(band):
+    """Clé 64 bits des lignes d'une bande (combinaison polynomiale de ses minima)"""
+    keys = np.zeros(len(band), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in band.T:
+            keys = keys * np.uint64(0x100000001B3) + column.astype(np.uint64)
+    return keys
+
+
+def _connected_components(n, left, right):
+    """Étiquette de chaque nœud : le plus petit indice de sa composante connexe"""
+    parent = np.arange(n)
+    while len(left):
+        root_left, root_right = parent[left], parent[right]
+        low, high = np.minimum(root_left, root_right), np.maximum(root_left, root_right)
+        linked = low != high
+        if not linked.any():
+            break
+        np.minimum.at(parent, high[linked], low[linked])
+        # Compression des chemins : chaque nœud pointe vers sa racine
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        left, right = left[linked], right[linked]
+    return parent
+
+
+def lsh_clusters(signatures, bands=BANDS, threshold=THRESHOLD, chunk_size=_CHUNK_SIZE):
+    """
+    Groupe de chaque texte (indice de son représentant, le plus petit du
+    groupe) à partir des signatures MinHash. num_perm doit être divisible
+    par bands.
+    """
+    n, num_perm = signatures.shape
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) doit être divisible par bands ({bands})")
+    rows_per_band = num_perm // bands
+    candidates = np.flatnonzero((signatures != np.uint32(2 ** 32 - 1)).any(axis=1))
+    if not len(candidates):
+        # Aucun texte, ou seulement des textes vides : chacun est son propre groupe
+        return np.arange(n)
+
+    left, right = [], []
+    for band in range(bands):
+        keys = _band_keys(signatures[candidates, band * rows_per_band:(band + 1) * rows_per_band])
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        # Chaque membre d'un groupe de la bande est relié au premier du groupe
+        first = np.repeat(order[starts], np.diff(np.r_[starts, len(order)]))
+        paired = first != order
+        left.append(candidates[first[paired]])
+        right.append(candidates[order[paired]])
+
+    left = np.concatenate(left) if left else np.empty(0, dtype=np.int64)
+    right = np.concatenate(right) if right else np.empty(0, dtype=np.int64)
+    if len(left):
+        pairs = np.unique(np.stack([left, right], axis=1), axis=0)
+        left, right = pairs[:, 0], pairs[:, 1]
+
+    # Similarité estimée des paires candidates, par lots
+    keep = np.zeros(len(left), dtype=bool)
+    for start in range(0, len(left), chunk_size):
+        stop = start + chunk_size
+        agreement = (signatures[left[start:stop]] == signatures[right[start:stop]]).mean(axis=1)
+        keep[start:stop] = agreement >= threshold
+    return _connected_components(n, left[keep], right[keep])
+
+
+def near_duplicate_clusters(texts, num_perm=NUM_PERM, bands=BANDS, k=SHINGLE_SIZE,
+                            threshold=THRESHOLD, seed=42):
+    """Étiquette de groupe de chaque texte (l'indice positionnel de son représentant)"""
+    signatures = minhash_signatures(texts, num_perm=num_perm, k=k, seed=seed)
+    return lsh_clusters(signatures, bands=bands, threshold=threshold)
+
+
+def drop_near_duplicates(df, column='tweet_cleaned', num_perm=NUM_PERM, bands=BANDS,
+                         k=SHINGLE_SIZE, threshold=THRESHOLD, seed=42):
+    """
+    Copie de df sans les quasi-doublons de column : seul le premier texte de
+    chaque groupe est gardé. Retourne (df dédupliqué, étiquettes de groupe).
+    """
+    labels = near_duplicate_clusters(df[column].tolist(), num_perm=num_perm, bands=bands, k=k,
+                                     threshold=threshold, seed=seed)
+    representative = labels == np.arange(len(labels))
+    return df[representative].copy(), labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suppression des quasi-doublons (MinHash / LSH)")
+    parser.add_argument('input', help='CSV nettoyé (sortie de clean_tweet)')
+    parser.add_argument('-o', '--output', help='CSV sans quasi-doublons')
+    parser.add_argument('--column', default='tweet_cleaned', help='Colonne texte (défaut: tweet_cleaned)')
+    parser.add_argument('--clean', action='store_true',
+                        help='Remplir --column avec clean_series(Tweet) (fichier sans colonne nettoyée)')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f'Similarité de Jaccard minimale (défaut: {THRESHOLD})')
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM)
+    parser.add_argument('--bands', type=int, default=BANDS)
+    parser.add_argument('-k', '--shingle-size', type=int, default=SHINGLE_SIZE)
+    parser.add_argument('--examples', type=int, default=5, help='Groupes affichés en exemple')
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    if args.clean:
+        from cleaning import clean_series
+        df[args.column] = clean_series(df['Tweet'])
+    elif args.column not in df:
+        parser.error(f"Pas de colonne '{args.column}' dans {args.input} "
+                     f"(colonnes : {', '.join(df.columns)}) ; --clean pour nettoyer Tweet")
+    start = time.perf_counter()
+    deduped, labels = drop_near_duplicates(df, column=args.column, num_perm=args.num_perm,
+                                           bands=args.bands, k=args.shingle_size,
+                                           threshold=args.threshold)
+    elapsed = time.perf_counter() - start
+    print(f"{len(df)} textes, {len(deduped)} gardés, {len(df) - len(deduped)} quasi-doublons "
+          f"retirés en {elapsed:.2f} s")
+
+    sizes = pd.Series(labels).value_counts()
+    for label in sizes[sizes > 1].index[:args.examples]:
+        members = df[args.column].iloc[np.flatnonzero(labels == label)]
+        print(f"\nGroupe de {len(members)} textes :")
+        for text in members.head(3):
+            print(f"  {str(text)[:100]}")
+
+    if args.output:
+        deduped.to_csv(args.output, index=False)
+        print(f"\nSauvegardé dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
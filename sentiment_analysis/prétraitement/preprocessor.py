@@ -0,0 +1,190 @@
+"""
+Prétraitement des tweets : nettoyage, tokenisation et lemmatisation.
+
+Version importable du TweetPreprocessor de Netoyage.ipynb, avec une API par
+lots qui fait passer les textes nettoyés dans ``nlp.pipe`` au lieu d'appeler
+``nlp(text)`` tweet par tweet.
+"""
+import hashlib
+import json
+
+import pandas as pd
+import spacy
+from spacy.lang.fr.stop_words import STOP_WORDS as fr_stop_words
+from nltk.stem import SnowballStemmer
+
+from cache import hash_text
+from cleaning import clean_series, clean_tweet, remove_emojis
+
+SPACY_MODEL = "fr_core_news_sm"
+
+# Composants spaCy inutiles pour la lemmatisation (le lemmatizer ne dépend que
+# du morphologizer / attribute_ruler)
+EXCLUDED_PIPES = ["parser", "ner"]
+
+# Stop words spécifiques aux réseaux sociaux
+CUSTOM_STOP_WORDS = {
+    'rt', 'via', 'amp', 'http', 'https', 'www', 'com', 'org', 'fr',
+    'like', 'follow', 'share', 'retweet', 'tweet', 'twitter', 'cc',
+    'alors', 'donc', 'tout', 'tous', 'toute', 'toutes', 'être', 'avoir',
+    'faire', 'dire', 'aller', 'voir', 'savoir', 'pouvoir', 'falloir',
+    'vouloir', 'venir', 'devoir', 'prendre', 'donner', 'mettre', 'partir'
+}
+
+EXCLUDED_POS = {'PRON', 'ADP', 'CCONJ', 'SCONJ', 'DET'}
+
+
+def load_nlp(model_name=SPACY_MODEL):
+    """Charger le modèle spaCy sans parser ni NER, ou None s'il est absent"""
+    try:
+        nlp = spacy.load(model_name, exclude=EXCLUDED_PIPES)
+        print(f" Modèle spaCy français chargé ({model_name})")
+        return nlp
+    except OSError:
+        print(f" Modèle spaCy non trouvé. Exécutez: python -m spacy download {model_name}")
+        return None
+
+
+class TweetPreprocessor:
+    def __init__(self, nlp=None, batch_size=1000, n_process=1, cache=None):
+        # Stop words français + mots spécifiques aux réseaux sociaux
+        self.stop_words = fr_stop_words.copy()
+        self.stop_words.update(CUSTOM_STOP_WORDS)
+
+        # Stemmer français
+        self.stemmer = SnowballStemmer('french')
+
+        # spaCy pour lemmatisation
+        self.nlp = nlp if nlp is not None else load_nlp()
+
+        # Paramètres de nlp.pipe
+        self.batch_size = batch_size
+        self.n_process = n_process
+
+        # Cache persistant des tokens (cache.PreprocessingCache), optionnel
+        self.cache = cache
+
+    def config_key(self):
+        """Empreinte de la configuration : stop words, modèle spaCy, filtre POS"""
+        if self.nlp:
+            meta = self.nlp.meta
+            model = f"{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}"
+            pipes = list(self.nlp.pipe_names)
+        else:
+            model, pipes = 'snowball-french', []
+        config = {
+            'stop_words': sorted(self.stop_words),
+            'model': model,
+            'spacy': spacy.__version__,
+            'pipes': pipes,
+            'excluded_pos': sorted(EXCLUDED_POS),
+        }
+        return hashlib.sha1(json.dumps(config, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def clean_tweet(self, text):
+        """Nettoyage spécifique aux tweets (voir cleaning.py)"""
+        return clean_tweet(text)
+
+    def remove_emojis(self, text):
+        """Supprimer emojis"""
+        return remove_emojis(text)
+
+    def _keep_token(self, token):
+        """Filtre appliqué à chaque token spaCy"""
+        return (not token.is_stop and
+                not token.is_punct and
+                not token.is_space and
+                len(token.text) > 2 and
+                token.lemma_.lower() not in self.stop_words and
+                token.pos_ not in EXCLUDED_POS)
+
+    def _doc_to_tokens(self, doc):
+        return [token.lemma_.lower() for token in doc if self._keep_token(token)]
+
+    def _fallback_tokens(self, text):
+        """Fallback sans spaCy : découpage sur les espaces + stemming"""
+        tokens = text.split()
+        tokens = [t for t in tokens if len(t) > 2 and t not in self.stop_words]
+        return [self.stemmer.stem(token) for token in tokens]
+
+    def tokenize_and_lemmatize(self, text):
+        """Tokenisation et lemmatisation avec spaCy"""
+        if not text or not text.strip():
+            return []
+
+        if self.nlp:
+            return self._doc_to_tokens(self.nlp(text))
+        else:
+            return self._fallback_tokens(text)
+
+    def tokenize_batch(self, texts):
+        """Tokenisation et lemmatisation d'une liste de textes nettoyés via nlp.pipe"""
+        texts = list(texts)
+        tokens = [[] for _ in texts]
+
+        # Les textes vides ne passent pas dans spaCy
+        todo = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not todo:
+            return tokens
+
+        if self.nlp:
+            docs = self.nlp.pipe((texts[i] for i in todo),
+                                 batch_size=self.batch_size,
+                                 n_process=self.n_process)
+            for i, doc in zip(todo, docs):
+                tokens[i] = self._doc_to_tokens(doc)
+        else:
+            for i in todo:
+                tokens[i] = self._fallback_tokens(texts[i])
+        return tokens
+
+    def _tokenize_cached(self, cleaned):
+        """tokenize_batch en ne calculant que les textes absents du cache"""
+        tokens = [[] for _ in cleaned]
+        todo = [i for i, text in enumerate(cleaned) if text]
+        if not todo:
+            return tokens
+
+        # Les tokens ne dépendent que du texte nettoyé : on le hash plutôt que
+        # le tweet brut, une URL ou une mention différente ne fait pas rater le cache
+        config_key = self.config_key()
+        keys = {i: hash_text(cleaned[i], config_key) for i in todo}
+        found = self.cache.get_many(list(keys.values()))
+
+        missing = {}
+        for i, key in keys.items():
+            if key not in found:
+                missing.setdefault(key, cleaned[i])
+        if missing:
+            computed = self.tokenize_batch(missing.values())
+            found.update(zip(missing.keys(), computed))
+            self.cache.put_many(zip(missing.keys(), computed))
+
+        for i, key in keys.items():
+            tokens[i] = found[key]
+        return tokens
+
+    def preprocess_tweet(self, text):
+        """Pipeline complet"""
+        cleaned = self.clean_tweet(text)
+        tokens = self.tokenize_and_lemmatize(cleaned)
+        return tokens, ' '.join(tokens)
+
+    def preprocess_batch(self, texts):
+        """Pipeline complet sur un lot : (textes nettoyés, tokens, textes finaux)"""
+        cleaned = clean_series(pd.Series(list(texts), dtype=object)).tolist()
+        if self.cache is None:
+            tokens = self.tokenize_batch(cleaned)
+        else:
+            tokens = self._tokenize_cached(cleaned)
+        final = [' '.join(t) for t in tokens]
+        return cleaned, tokens, final
+
+    def preprocess_dataframe(self, df, column='Tweet'):
+        """Ajoute tweet_cleaned, tokens et text_final à une copie de df en une seule passe"""
+        cleaned, tokens, final = self.preprocess_batch(df[column].tolist())
+        df = df.copy()
+        df['tweet_cleaned'] = cleaned
+        df['tokens'] = tokens
+        df['text_final'] = final
+        return df
@@ -0,0 +1,131 @@
+#author: artemis
+"""
+Check and time the tweet extraction of scrapper.py on a saved timeline.
+
+Loads fixtures/x_search_timeline.html in headless Chrome, optionally
+duplicates its articles (with distinct status URLs) to mimic a long
+timeline, then:
+
+- checks that extract_visible_tweets (one execute_script) returns the same
+  rows as extract_tweets_elements (one WebDriver call per field);
+- checks that already extracted status URLs are skipped, both on the next
+  pass and after a page reload (seeded from Python);
+- prints the time of each extraction mode.
+
+The driver comes from create_driver, as in scrapper.py, without request
+blocking (the fixture is a local file). By default Selenium Manager uses the
+chromedriver and Chrome already installed (PATH, usual locations), so the
+check runs offline; --chromedriver gives the driver path explicitly, and
+"auto" downloads it with webdriver-manager. --debugger-address attaches to a
+Chromium that is already running with remote debugging (chrome
+--remote-debugging-port=9222, or an embedded Chromium such as Qt WebEngine
+with QTWEBENGINE_REMOTE_DEBUGGING=9222) instead of starting Chrome.
+
+Chromium 140 (Qt WebEngine 6.11, offscreen) with chromedriver 140, rows
+identical in both modes:
+
+    articles   per-element      batch   batch, all seen
+          3       332.8 ms     5.3 ms            3.6 ms
+         60      6586.2 ms    18.4 ms            4.4 ms
+        300     38250.5 ms    60.3 ms            6.4 ms
+
+    python bench_extraction.py
+    python bench_extraction.py --chromedriver /usr/local/bin/chromedriver
+    python bench_extraction.py --debugger-address 127.0.0.1:9222 --chromedriver ./chromedriver
+    python bench_extraction.py --copies 100 --fixture fixtures/x_search_timeline.html
+"""
+import argparse
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from driver_factory import create_driver
+from scrapper import extract_tweets_elements, extract_visible_tweets
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'x_search_timeline.html')
+
+# Clone every article `copies` times, giving each clone its own status URL
+DUPLICATE_JS = """
+const copies = arguments[0];
+const cells = Array.from(document.querySelectorAll('div[data-testid="cellInnerDiv"]'));
+const timeline = cells[0].parentNode;
+for (let k = 1; k < copies; k++) {
+    for (const cell of cells) {
+        const clone = cell.cloneNode(true);
+        const status = clone.querySelector('a[href*="/status/"]');
+        status.href = status.href + k;
+        timeline.appendChild(clone);
+    }
+}
+return document.querySelectorAll('article[data-testid="tweet"]').length;
+"""
+
+
+def load(driver, fixture, copies):
+    driver.get('file://' + os.path.abspath(fixture))
+    return driver.execute_script(DUPLICATE_JS, copies)
+
+
+def attach_driver(address, chromedriver_path=None):
+    """Driver for a Chromium already listening for DevTools on address (host:port)"""
+    options = Options()
+    options.debugger_address = address
+    if chromedriver_path:
+        return webdriver.Chrome(service=Service(chromedriver_path), options=options)
+    return webdriver.Chrome(options=options)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check batch vs per-element tweet extraction")
+    parser.add_argument('--fixture', default=FIXTURE, help='Saved timeline HTML')
+    parser.add_argument('--copies', type=int, default=20, help='Copies of each fixture article')
+    parser.add_argument('--chromedriver', default=None,
+                        help='Local chromedriver path, or "auto" for webdriver-manager '
+                             '(default: Selenium Manager, installed driver)')
+    parser.add_argument('--show', action='store_true', help='Run Chrome with a window')
+    parser.add_argument('--debugger-address',
+                        help='host:port of a running Chromium to attach to instead of starting Chrome')
+    args = parser.parse_args()
+    if args.debugger_address and args.chromedriver == 'auto':
+        parser.error("--debugger-address needs a chromedriver path matching the running browser")
+
+    if args.debugger_address:
+        driver = attach_driver(args.debugger_address, args.chromedriver)
+    else:
+        driver = create_driver(headless=not args.show, chromedriver_path=args.chromedriver,
+                               block=False, metrics=False)
+    try:
+        n_articles = load(driver, args.fixture, args.copies)
+
+        legacy, legacy_time = timed(extract_tweets_elements, driver)
+        seen_status = set()
+        batch, batch_time = timed(extract_visible_tweets, driver, seen_status, seed=True)
+        assert batch == legacy, "batch extraction differs from per-element extraction"
+        assert len(seen_status) == n_articles, "every article should have a status URL"
+
+        again, again_time = timed(extract_visible_tweets, driver, seen_status)
+        assert again == [], "articles already extracted were returned again"
+
+        load(driver, args.fixture, args.copies)
+        reloaded = extract_visible_tweets(driver, seen_status, seed=True)
+        assert reloaded == [], "seeded status URLs were not skipped after reload"
+
+        print(f"{n_articles} articles, {len(batch)} rows identical in both modes")
+        print(f"per-element extraction  {legacy_time * 1000:9.1f} ms")
+        print(f"batch extraction        {batch_time * 1000:9.1f} ms  ({legacy_time / batch_time:.0f}x)")
+        print(f"batch, all seen         {again_time * 1000:9.1f} ms")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    main()
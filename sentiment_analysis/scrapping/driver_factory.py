@@ -0,0 +1,202 @@
+#author: artemis
+"""
+Chrome driver factory shared by the Selenium scrapers (scrapper.py, fb_scraping.py).
+
+create_driver starts Chrome with a minimal headless profile:
+
+- background services, sync, extensions, first-run pages and audio are off,
+  images are not decoded (their src attributes stay in the DOM);
+- video, fonts, images and analytics / ad domains are blocked through the
+  DevTools protocol (Network.setBlockedURLs), before any byte is downloaded;
+- with `profile_dir`, a persistent user-data-dir keeps cookies between runs,
+  so the login session survives restarts (one directory per browser: Chrome
+  locks it);
+- PageMetrics reads the DevTools network events to report the bytes
+  transferred, requests, blocked requests and load time of each page.
+
+    driver = create_driver(profile_dir="profiles/x")
+    metrics = PageMetrics(driver)
+    driver.get(url)
+    print(metrics.collect(url))
+"""
+import json
+import logging
+import os
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+try:
+    from webdriver_manager.chrome import ChromeDriverManager
+    WEBDRIVER_MANAGER_AVAILABLE = True
+except ImportError:
+    WEBDRIVER_MANAGER_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+MINIMAL_ARGS = [
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+# Heavy resources, matched on the URL (Network.setBlockedURLs wildcards)
+MEDIA_PATTERNS = ["*.mp4*", "*.webm*", "*.m3u8*", "*.m4s*", "*.ts?*", "*video.twimg.com*"]
+FONT_PATTERNS = ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"]
+IMAGE_PATTERNS = ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+                  "*pbs.twimg.com/media*", "*format=jpg*", "*format=png*", "*format=webp*"]
+# Third-party analytics and ads
+TRACKER_PATTERNS = [
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*ads-twitter.com*", "*analytics.twitter.com*",
+    "*ads-api.twitter.com*", "*scorecardresearch.com*", "*adsrvr.org*",
+    "*facebook.com/tr?*", "*facebook.com/tr/*", "*an.facebook.com*", "*hotjar.com*",
+]
+
+
+def blocked_patterns(images=True, media=True, fonts=True, trackers=True, extra=()):
+    patterns = []
+    if media:
+        patterns += MEDIA_PATTERNS
+    if fonts:
+        patterns += FONT_PATTERNS
+    if images:
+        patterns += IMAGE_PATTERNS
+    if trackers:
+        patterns += TRACKER_PATTERNS
+    return patterns + list(extra)
+
+
+def build_options(headless=True, profile_dir=None, block_images=True, user_agent=USER_AGENT,
+                  window_size=(1366, 900), metrics=True):
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    for arg in MINIMAL_ARGS:
+        options.add_argument(arg)
+    options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+    if user_agent:
+        options.add_argument(f"--user-agent={user_agent}")
+    if block_images:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+        options.add_argument("--profile-directory=Default")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("prefs", {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.managed_default_content_settings.images": 2 if block_images else 1,
+    })
+    if metrics:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def block_requests(driver, patterns):
+    """Block every request whose URL matches one of the wildcard patterns"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+
+
+def create_driver(headless=True, profile_dir=None, chromedriver_path="auto", block=True,
+                  block_images=True, extra_blocked=(), metrics=True, user_agent=USER_AGENT):
+    """
+    Chrome with the minimal profile. chromedriver_path: a path, "auto"
+    (webdriver-manager if installed, else Selenium Manager) or None (Selenium Manager).
+    """
+    options = build_options(headless, profile_dir, block_images, user_agent, metrics=metrics)
+    if chromedriver_path == "auto":
+        chromedriver_path = ChromeDriverManager().install() if WEBDRIVER_MANAGER_AVAILABLE else None
+    if chromedriver_path:
+        driver = webdriver.Chrome(service=Service(chromedriver_path), options=options)
+    else:
+        driver = webdriver.Chrome(options=options)
+
+    if block:
+        patterns = blocked_patterns(images=block_images, extra=extra_blocked)
+        block_requests(driver, patterns)
+        logger.info(f"Blocking {len(patterns)} URL patterns (media, fonts, trackers"
+                    f"{', images' if block_images else ''})")
+    return driver
+
+
+NAVIGATION_TIMING_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+if (!nav) return null;
+return {load_ms: nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+        dom_content_loaded_ms: nav.domContentLoadedEventEnd};
+"""
+
+
+class PageMetrics:
+    """
+    Bytes, requests and blocked requests since the previous collect(), from
+    the DevTools performance log (driver created with metrics=True), plus the
+    navigation timing of the current page.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = []
+
+    def _network(self):
+        stats = {'bytes': 0, 'requests': 0, 'blocked': 0, 'failed': 0}
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.debug(f"Performance log unavailable: {e}")
+            return stats
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            if method == "Network.loadingFinished":
+                stats['requests'] += 1
+                stats['bytes'] += int(message["params"].get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed":
+                if message["params"].get("blockedReason"):
+                    stats['blocked'] += 1
+                else:
+                    stats['failed'] += 1
+        return stats
+
+    def collect(self, label=None):
+        page = {'page': label or self.driver.current_url}
+        page.update(self._network())
+        try:
+            timing = self.driver.execute_script(NAVIGATION_TIMING_JS) or {}
+        except Exception:
+            timing = {}
+        page.update(timing)
+        self.pages.append(page)
+        return page
+
+    def totals(self):
+        return {
+            'pages': len(self.pages),
+            'bytes': sum(p['bytes'] for p in self.pages),
+            'requests': sum(p['requests'] for p in self.pages),
+            'blocked': sum(p['blocked'] for p in self.pages),
+        }
+
+    @staticmethod
+    def describe(page):
+        load = page.get('load_ms')
+        return (f"{page['page']}: {page['bytes'] / 1024:.0f} KiB in {page['requests']} requests, "
+                f"{page['blocked']} blocked"
+                + (f", loaded in {load:.0f} ms" if load else ""))
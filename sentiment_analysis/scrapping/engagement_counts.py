@@ -0,0 +1,79 @@
+#author: artemis
+"""
+Engagement counts as integers, for every scraper.
+
+Facebook and X display counts as localized labels ("1,2 k J'aime",
+"3 commentaires", "1.2K", "12,5 k", "2 M views", "1 234"). One precompiled
+pattern reads them:
+
+- k / mille / thousand -> x 1 000, m / million(s) / mio -> x 1 000 000,
+  md(s) / milliard(s) / b / bn / billion(s) -> x 1 000 000 000; a suffix only
+  counts when it is not the start of a word ("87 comments", "5 mentions");
+- groups of three digits after "," "." "'" or a (non-breaking) space are
+  thousands ("1,234", "1 234"), otherwise "," or "." is the decimal
+  separator ("1,2 k" = 1200);
+- a label without any number is 0.
+
+parse_count converts one label; parse_counts converts a whole column at
+once to int64 (parsing each distinct label only once), or to nullable
+Int64 that keeps missing values with missing=None.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+_THOUSANDS_SEP = r"[\s.,']"
+COUNT_PATTERN = re.compile(
+    r"(?P<integer>\d{1,3}(?:" + _THOUSANDS_SEP + r"\d{3})+(?!\d)|\d+)"
+    r"(?:[.,](?P<fraction>\d+))?"
+    r"(?:\s*(?:(?P<billion>milliards?|billions?|mds?|bn|b)"
+    r"|(?P<million>millions?|mio|m)"
+    r"|(?P<thousand>mille|thousands?|k))(?![^\W\d_]))?",
+    re.IGNORECASE,
+)
+_NON_DIGITS = re.compile(r"\D")
+
+
+def parse_count(text) -> int:
+    """'1,2 k J'aime' -> 1200, '3 commentaires' -> 3, '' / None / NaN -> 0"""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return 0
+    if isinstance(text, (int, np.integer)):
+        return int(text)
+    match = COUNT_PATTERN.search(str(text))
+    if not match:
+        return 0
+    value = int(_NON_DIGITS.sub("", match.group("integer")))
+    fraction = match.group("fraction")
+    if match.group("billion"):
+        multiplier = 10 ** 9
+    elif match.group("million"):
+        multiplier = 10 ** 6
+    elif match.group("thousand"):
+        multiplier = 10 ** 3
+    else:
+        multiplier = 1
+    if fraction:
+        # Exact integer arithmetic: 1,25 k = (125 * 1000) / 100
+        scale = 10 ** len(fraction)
+        return round((value * scale + int(fraction)) * multiplier / scale)
+    return value * multiplier
+
+
+def parse_counts(values, missing=0) -> pd.Series:
+    """
+    parse_count over a whole column: labels repeat a lot, so each distinct
+    label is parsed once (factorize) and the results are spread back with a
+    numpy take. Missing values become `missing` (int64 result), or stay <NA>
+    with missing=None (nullable Int64 result).
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = np.fromiter((parse_count(label) for label in uniques), dtype=np.int64, count=len(uniques))
+    is_missing = codes < 0
+    counts = parsed.take(np.where(is_missing, 0, codes)) if len(parsed) else np.zeros(len(codes), np.int64)
+    if missing is None:
+        return pd.Series(pd.arrays.IntegerArray(counts, is_missing), index=series.index, name=series.name)
+    counts[is_missing] = missing
+    return pd.Series(counts, index=series.index, name=series.name)
@@ -11,15 +11,14 @@ import json
 import csv
 import logging
 import os
+import queue
 import sys
+import threading
 from typing import List, Dict, Optional
 import pandas as pd
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -31,8 +30,20 @@ from selenium.common.exceptions import (
     StaleElementReferenceException
 )
 from bs4 import BeautifulSoup
+import soupsieve
+
+from driver_factory import PageMetrics, create_driver
+from engagement_counts import parse_count
+from scroll_control import ScrollController
 logger = logging.getLogger(__name__)
 
+# lxml is the fastest BeautifulSoup backend; html.parser is the fallback
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 # Try to import webdriver-manager for automatic ChromeDriver management
 try:
     from webdriver_manager.chrome import ChromeDriverManager
@@ -67,17 +78,74 @@ class FacebookPost:
     shares_count: int = 0
     comments_count: int = 0
     comments: List[Dict] = None
+    source_url: str = ""
     
     def __post_init__(self):
         if self.comments is None:
             self.comments = []
 
+# Selectors shared by the live (WebDriver) and offline (page_source) extraction
+POST_SELECTORS = [
+    '[data-ad-preview="message"]',
+    '[data-testid="post_message"]',
+    '.userContentWrapper'
+]
+TEXT_SELECTORS = [
+    '[data-ad-preview="message"]',
+    '[data-testid="post_message"]',
+    '.userContent',
+    '.x11i5rnm.xat24cr.x1mh8g0r'
+]
+AUTHOR_SELECTORS = [
+    'a[role="link"][tabindex="0"]',
+    '.actor-link',
+    '[data-testid="post_chevron_title"]'
+]
+SEE_MORE_SELECTORS = [
+    '[role="button"][tabindex="0"]',
+    '.see_more_link',
+    'span[dir="auto"]'  # Generic selector for "See More"
+]
+SEE_MORE_LABELS = ["voir plus", "see more"]
+
+# Clicks the first "See more" button of every post in the page in one call,
+# returns how many were clicked
+EXPAND_ALL_JS = """
+const [postSelectors, buttonSelector, labels] = arguments;
+let posts = [];
+for (const selector of postSelectors) {
+    posts = document.querySelectorAll(selector);
+    if (posts.length) break;
+}
+let clicked = 0;
+for (const post of posts) {
+    for (const button of post.querySelectorAll(buttonSelector)) {
+        const label = (button.innerText || '').trim().toLowerCase();
+        if (label.length <= 20 && labels.some(l => label.includes(l))) {
+            button.click();
+            clicked++;
+            break;
+        }
+    }
+}
+return clicked;
+"""
+
 class FacebookScraper:
     """Improved Facebook scraper with modern Selenium practices"""
     
-    def __init__(self, chromedriver_path: str = "auto", headless: bool = False):
+    def __init__(self, chromedriver_path: str = "auto", headless: bool = False,
+                 profile_dir: Optional[str] = None):
         self.driver = None
         self.wait = None
+        self.scroller = None
+        self.metrics = None
+        # Error that ended the last scrape_search_results early (None if it completed)
+        self.last_error: Optional[Exception] = None
+        # Set by ScraperPool to stop scrolling when the run is interrupted
+        self.stop_event: Optional[threading.Event] = None
+        # Persistent Chrome profile: the Facebook session survives restarts
+        self.profile_dir = profile_dir
         if chromedriver_path == "auto":
             self.chromedriver_path = self._find_chromedriver()
         else:
@@ -85,7 +153,8 @@ class FacebookScraper:
         self.headless = headless
         self._setup_driver()
     
-    def _find_chromedriver(self) -> str:
+    @staticmethod
+    def _find_chromedriver() -> str:
         """Find chromedriver in common locations or use webdriver-manager"""
         
         # Method 1: Try webdriver-manager (automatic download and management)
@@ -125,64 +194,24 @@ class FacebookScraper:
         return None  # This will trigger automatic management in newer Selenium versions
     
     def _setup_driver(self):
-        """Setup Chrome driver with optimized options and automatic ChromeDriver management"""
-        chrome_options = Options()
-        
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        
-        # Performance and stability options
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")  # Faster loading
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        
-        # Privacy options
-        chrome_options.add_argument("--disable-webrtc")
-        chrome_options.add_argument("--disable-webgl")
-        
-        # Notification settings
-        prefs = {
-            "profile.default_content_setting_values.notifications": 2,
-            "profile.managed_default_content_settings.images": 2
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
+        """Setup Chrome with the minimal profile of driver_factory (resource blocking, persistent session)"""
         try:
-            # Try different methods to initialize ChromeDriver
-            if self.chromedriver_path and self.chromedriver_path != "auto":
-                # Method 1: Use specified path
-                logger.info(f"Using specified ChromeDriver path: {self.chromedriver_path}")
-                service = Service(self.chromedriver_path)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            elif self.chromedriver_path:
-                # Method 2: Use automatically found path
-                logger.info(f"Using automatically found ChromeDriver: {self.chromedriver_path}")
-                service = Service(self.chromedriver_path)
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            else:
-                # Method 3: Let Selenium handle it automatically (Selenium 4.6+)
-                logger.info("Using Selenium's automatic ChromeDriver management")
-                try:
-                    self.driver = webdriver.Chrome(options=chrome_options)
-                except Exception as selenium_auto_error:
-                    logger.warning(f"Selenium auto-management failed: {selenium_auto_error}")
-                    
-                    # Method 4: Fallback to webdriver-manager if available
-                    if WEBDRIVER_MANAGER_AVAILABLE:
-                        logger.info("Falling back to webdriver-manager")
-                        service = Service(ChromeDriverManager().install())
-                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                    else:
-                        raise selenium_auto_error
+            try:
+                self.driver = create_driver(headless=self.headless, profile_dir=self.profile_dir,
+                                            chromedriver_path=self.chromedriver_path)
+            except Exception as selenium_auto_error:
+                if self.chromedriver_path or not WEBDRIVER_MANAGER_AVAILABLE:
+                    raise
+                # Selenium's automatic management failed: fall back to webdriver-manager
+                logger.warning(f"Selenium auto-management failed: {selenium_auto_error}")
+                logger.info("Falling back to webdriver-manager")
+                self.driver = create_driver(headless=self.headless, profile_dir=self.profile_dir,
+                                            chromedriver_path=ChromeDriverManager().install())
             
-            self.driver.maximize_window()
             self.wait = WebDriverWait(self.driver, 10)
+            self.scroller = ScrollController(self.driver, ', '.join(POST_SELECTORS),
+                                             max_timeout=10, jitter=(0.5, 1.5))
+            self.metrics = PageMetrics(self.driver)
             logger.info("Chrome driver initialized successfully")
             
         except Exception as e:
@@ -195,9 +224,18 @@ class FacebookScraper:
             raise
 
 
+    def has_session(self) -> bool:
+        """True if the Chrome profile is still logged in to Facebook"""
+        self.driver.get("https://www.facebook.com/")
+        return self.driver.get_cookie("c_user") is not None
+
     def login(self, email: str, password: str) -> bool:
         """Login to Facebook with improved error handling"""
         try:
+            if self.profile_dir and self.has_session():
+                logger.info(f"Reusing the session saved in {self.profile_dir}")
+                return True
+            
             logger.info("Attempting to login to Facebook...")
             self.driver.get("https://www.facebook.com/login")
             
@@ -217,11 +255,10 @@ class FacebookScraper:
             # Click login
             login_button.click()
             
-            # Wait for login to complete
-            time.sleep(5)
-            
-            # Check if login was successful
-            if "login" in self.driver.current_url.lower():
+            # Wait for login to complete (leaving the login page), at most 15s
+            try:
+                WebDriverWait(self.driver, 15).until(lambda d: "login" not in d.current_url.lower())
+            except TimeoutException:
                 logger.error("Login failed - still on login page")
                 return False
                 
@@ -235,19 +272,10 @@ class FacebookScraper:
             logger.error(f"Login error: {e}")
             return False
     
-    def safe_scroll(self, pause_time: float = 2) -> bool:
-        """Safely scroll page with duplicate detection"""
+    def safe_scroll(self, timeout: Optional[float] = None) -> bool:
+        """Scroll to the bottom and wait until new posts are loaded (ScrollController)"""
         try:
-            last_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            # Scroll to bottom
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause_time)
-            
-            # Check if new content loaded
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            return new_height > last_height
-            
+            return self.scroller.scroll(timeout)
         except Exception as e:
             logger.warning(f"Scroll error: {e}")
             return False
@@ -260,14 +288,7 @@ class FacebookScraper:
             # Extract post text
             try:
                 # Try multiple selectors for post text
-                text_selectors = [
-                    '[data-ad-preview="message"]',
-                    '[data-testid="post_message"]',
-                    '.userContent',
-                    '.x11i5rnm.xat24cr.x1mh8g0r'
-                ]
-                
-                for selector in text_selectors:
+                for selector in TEXT_SELECTORS:
                     try:
                         text_element = post_element.find_element(By.CSS_SELECTOR, selector)
                         post.text = text_element.text.strip()
@@ -281,13 +302,7 @@ class FacebookScraper:
             
             # Extract author
             try:
-                author_selectors = [
-                    'a[role="link"][tabindex="0"]',
-                    '.actor-link',
-                    '[data-testid="post_chevron_title"]'
-                ]
-                
-                for selector in author_selectors:
+                for selector in AUTHOR_SELECTORS:
                     try:
                         author_element = post_element.find_element(By.CSS_SELECTOR, selector)
                         post.author = author_element.text.strip()
@@ -328,7 +343,8 @@ class FacebookScraper:
         
         return post
     
-    def _extract_post_id_from_url(self, url: str) -> str:
+    @staticmethod
+    def _extract_post_id_from_url(url: str) -> str:
         """Extract post ID from Facebook URL"""
         try:
             if "/posts/" in url:
@@ -342,13 +358,7 @@ class FacebookScraper:
     def expand_post_text(self, post_element) -> bool:
         """Try to expand 'See More' links in posts"""
         try:
-            see_more_selectors = [
-                '[role="button"][tabindex="0"]',
-                '.see_more_link',
-                'span[dir="auto"]'  # Generic selector for "See More"
-            ]
-            
-            for selector in see_more_selectors:
+            for selector in SEE_MORE_SELECTORS:
                 try:
                     see_more_buttons = post_element.find_elements(By.CSS_SELECTOR, selector)
                     for button in see_more_buttons:
@@ -393,23 +403,10 @@ class FacebookScraper:
         except Exception as e:
             logger.debug(f"Error extracting engagement counts: {e}")
 
-    def _parse_count_from_text(self, text: str) -> int:
-        """Parse integer count from text like '12 likes', '1.2K shares'"""
-        try:
-            text = text.lower().replace(',', '').strip()
-            if 'k' in text:
-                return int(float(text.replace('k', '')) * 1000)
-            elif 'm' in text:
-                return int(float(text.replace('m', '')) * 1_000_000)
-            else:
-                # Extract digits
-                import re
-                match = re.search(r'\d+', text)
-                if match:
-                    return int(match.group())
-        except Exception:
-            pass
-        return 0
+    @staticmethod
+    def _parse_count_from_text(text: str) -> int:
+        """Parse integer count from labels like '12 likes', '1.2K shares', '1,2 k J\'aime' (engagement_counts)"""
+        return parse_count(text)
 
     def extract_comments(self, post_element, post: FacebookPost, max_comments: int = 5):
         """Extract top-level comments from a post element"""
@@ -425,66 +422,98 @@ class FacebookScraper:
         except Exception as e:
             logger.debug(f"Error extracting comments: {e}")
     
-    def scrape_search_results(self, search_url: str, max_posts: int = 50, scroll_limit: int = 10) -> List[FacebookPost]:
-        """Scrape posts from Facebook search results"""
+    def expand_all_posts(self) -> int:
+        """Click the "See more" button of every post in the page with a single script call"""
+        try:
+            return self.driver.execute_script(EXPAND_ALL_JS, POST_SELECTORS,
+                                              ', '.join(SEE_MORE_SELECTORS), SEE_MORE_LABELS)
+        except Exception as e:
+            logger.debug(f"Could not expand posts: {e}")
+            return 0
+
+    def _parse_current_view(self, parser: "PostParser") -> List[FacebookPost]:
+        """Expand every post at once, then parse page_source offline"""
+        if self.expand_all_posts():
+            time.sleep(1)
+        posts = parser.parse(self.driver.page_source)
+        logger.info(f"Parsed {len(posts)} posts from page source")
+        return posts
+
+    def _extract_current_view(self):
+        """Live extraction: WebDriver calls for every post and field"""
+        posts_found = []
+        for selector in POST_SELECTORS:
+            try:
+                posts_found = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                if posts_found:
+                    break
+            except:
+                continue
+        
+        logger.info(f"Found {len(posts_found)} posts on current view")
+        
+        for post_element in posts_found:
+            try:
+                # Try to expand post text
+                self.expand_post_text(post_element)
+                
+                # Extract post data
+                yield self.extract_post_data(post_element)
+            except StaleElementReferenceException:
+                logger.debug("Stale element reference, skipping")
+                continue
+            except Exception as e:
+                logger.warning(f"Error processing post: {e}")
+                continue
+
+    def scrape_search_results(self, search_url: str, max_posts: int = 50, scroll_limit: int = 10,
+                              extraction: str = "html") -> List[FacebookPost]:
+        """
+        Scrape posts from Facebook search results.
+        extraction="html" parses page_source once per scroll (PostParser),
+        extraction="live" queries every field through WebDriver.
+        Errors are logged and the posts found so far are returned; the error
+        is kept in self.last_error.
+        """
+        self.last_error = None
         posts_data = []
         seen_posts = set()
         scroll_count = 0
+        parser = PostParser() if extraction == "html" else None
         
         try:
             logger.info(f"Navigating to search URL: {search_url}")
             self.driver.get(search_url)
-            time.sleep(5)
+            self.scroller.reset()
+            if not self.scroller.wait_for_items():
+                logger.warning("No post found after loading the page")
             
             while len(posts_data) < max_posts and scroll_count < scroll_limit:
-                # Find all post elements
-                post_selectors = [
-                    '[data-ad-preview="message"]',
-                    '[data-testid="post_message"]',
-                    '.userContentWrapper'
-                ]
-                
-                posts_found = []
-                for selector in post_selectors:
-                    try:
-                        posts_found = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if posts_found:
-                            break
-                    except:
-                        continue
-                
-                logger.info(f"Found {len(posts_found)} posts on current view")
+                if self.stop_event is not None and self.stop_event.is_set():
+                    logger.info("Stop requested, ending this URL")
+                    break
+                with self.scroller.extracting():
+                    if parser:
+                        candidates = self._parse_current_view(parser)
+                    else:
+                        candidates = list(self._extract_current_view())
                 
                 # Process each post
-                for post_element in posts_found:
-                    try:
-                        # Try to expand post text
-                        self.expand_post_text(post_element)
-                        
-                        # Extract post data
-                        post_data = self.extract_post_data(post_element)
-                        
-                        # Skip if we've seen this post (deduplicate by text + author)
-                        post_key = f"{post_data.author}:{post_data.text[:100]}"
-                        if post_key in seen_posts:
-                            continue
-                        
-                        seen_posts.add(post_key)
-                        
-                        # Only add if we have meaningful content
-                        if post_data.text.strip() or post_data.author.strip():
-                            posts_data.append(post_data)
-                            logger.info(f"Extracted post #{len(posts_data)} by {post_data.author}")
-                        
-                        if len(posts_data) >= max_posts:
-                            break
-                            
-                    except StaleElementReferenceException:
-                        logger.debug("Stale element reference, skipping")
-                        continue
-                    except Exception as e:
-                        logger.warning(f"Error processing post: {e}")
+                for post_data in candidates:
+                    # Skip if we've seen this post (deduplicate by text + author)
+                    post_key = f"{post_data.author}:{post_data.text[:100]}"
+                    if post_key in seen_posts:
                         continue
+                    
+                    seen_posts.add(post_key)
+                    
+                    # Only add if we have meaningful content
+                    if post_data.text.strip() or post_data.author.strip():
+                        posts_data.append(post_data)
+                        logger.info(f"Extracted post #{len(posts_data)} by {post_data.author}")
+                    
+                    if len(posts_data) >= max_posts:
+                        break
                 
                 # Scroll down
                 if not self.safe_scroll():
@@ -495,16 +524,20 @@ class FacebookScraper:
                 logger.info(f"Completed scroll {scroll_count}/{scroll_limit}")
                 
         except Exception as e:
+            self.last_error = e
             logger.error(f"Error during scraping: {e}")
         
         logger.info(f"Scraping completed. Extracted {len(posts_data)} unique posts")
+        logger.info(f"Scroll timing: {self.scroller.summary()}")
+        logger.info(f"Network: {PageMetrics.describe(self.metrics.collect(search_url))}")
         return posts_data
     
     def scrape_page_posts(self, page_url: str, max_posts: int = 50) -> List[FacebookPost]:
         """Scrape posts from a specific Facebook page"""
         return self.scrape_search_results(page_url, max_posts)
     
-    def save_data(self, posts: List[FacebookPost], output_format: str = "csv", filename: str = "facebook_posts"):
+    @staticmethod
+    def save_data(posts: List[FacebookPost], output_format: str = "csv", filename: str = "facebook_posts"):
         """Save scraped data in various formats"""
         if not posts:
             logger.warning("No data to save")
@@ -548,6 +581,82 @@ class FacebookScraper:
             self.driver.quit()
             logger.info("Browser closed")
 
+class PostParser:
+    """
+    Offline extraction of FacebookPost objects from HTML (driver.page_source
+    or a saved page), with the same selectors as extract_post_data. The page
+    is parsed once with lxml (html.parser without it) and every selector is
+    compiled once.
+    """
+
+    def __init__(self, max_comments: int = 5):
+        self.features = "lxml" if LXML_AVAILABLE else "html.parser"
+        self.max_comments = max_comments
+        self.post_patterns = [soupsieve.compile(s) for s in POST_SELECTORS]
+        self.text_patterns = [soupsieve.compile(s) for s in TEXT_SELECTORS]
+        self.author_patterns = [soupsieve.compile(s) for s in AUTHOR_SELECTORS]
+        self.link = soupsieve.compile('a[href*="/posts/"]')
+        self.image = soupsieve.compile('img[src*="scontent"]')
+        self.likes = soupsieve.compile('[aria-label*="like"]')
+        self.shares = soupsieve.compile('a[href*="/shares/"]')
+        self.comments_link = soupsieve.compile('a[href*="/comments/"]')
+        self.comment = soupsieve.compile('[aria-label="Comment"]')
+        self.comment_author = soupsieve.compile('a')
+        self.comment_text = soupsieve.compile('span')
+
+    @staticmethod
+    def _text(tag) -> str:
+        return tag.get_text(" ", strip=True) if tag is not None else ""
+
+    def _first_text(self, root, patterns) -> str:
+        for pattern in patterns:
+            text = self._text(pattern.select_one(root))
+            if text:
+                return text
+        return ""
+
+    def parse(self, html: str) -> List[FacebookPost]:
+        soup = BeautifulSoup(html, self.features)
+        for pattern in self.post_patterns:
+            elements = pattern.select(soup)
+            if elements:
+                break
+        else:
+            elements = []
+        return [self.parse_post(element) for element in elements]
+
+    def parse_post(self, element) -> FacebookPost:
+        post = FacebookPost()
+        post.text = self._first_text(element, self.text_patterns)
+        post.author = self._first_text(element, self.author_patterns)
+
+        link = self.link.select_one(element)
+        if link is not None:
+            post.link = link.get("href", "")
+            post.post_id = FacebookScraper._extract_post_id_from_url(post.link)
+
+        image = self.image.select_one(element)
+        if image is not None:
+            post.image_url = image.get("src", "")
+
+        likes = self.likes.select_one(element)
+        if likes is not None:
+            post.likes_count = FacebookScraper._parse_count_from_text(likes.get("aria-label", ""))
+        shares = self.shares.select_one(element)
+        if shares is not None:
+            post.shares_count = FacebookScraper._parse_count_from_text(self._text(shares))
+        comments = self.comments_link.select_one(element)
+        if comments is not None:
+            post.comments_count = FacebookScraper._parse_count_from_text(self._text(comments))
+
+        for comment in self.comment.select(element, limit=self.max_comments):
+            author = self.comment_author.select_one(comment)
+            text = self.comment_text.select_one(comment)
+            if author is not None and text is not None:
+                post.comments.append({'author': self._text(author), 'text': self._text(text)})
+        return post
+
+
 def get_credentials(scraper, credentials_list: List[tuple]) -> tuple:
     """
     Try multiple credentials until login succeeds.
@@ -576,11 +685,203 @@ def load_credentials_from_file(filepath: str) -> List[tuple]:
         except Exception as e:
             logger.error(f"Failed to read credentials file: {e}")
         return creds
+
+
+def load_urls_from_file(filepath: str) -> List[str]:
+    """One page or search URL per line, duplicates removed (order kept)"""
+    urls = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            url = line.strip()
+            if url and url not in urls:
+                urls.append(url)
+    return urls
+
+
+def post_key(post: FacebookPost) -> str:
+    """Dedup key: the post id when known, else author + start of the text"""
+    return post.post_id or f"{post.author}:{post.text[:100]}"
+
+
+@dataclass
+class WorkerStats:
+    """Throughput of one pool worker"""
+    worker: str
+    account: str = ""
+    urls: int = 0
+    failed_urls: int = 0
+    posts: int = 0
+    new_posts: int = 0
+    bytes: int = 0
+    startup_seconds: float = 0.0
+    busy_seconds: float = 0.0
+
+    @property
+    def posts_per_minute(self) -> float:
+        return 60 * self.posts / self.busy_seconds if self.busy_seconds else 0.0
+
+
+class ScraperPool:
+    """
+    Pool of headless FacebookScraper sessions working through many URLs.
+
+    Each worker thread starts one browser, logs in once with its own entry of
+    the credentials file (the next unused one if a login fails), then takes
+    URLs from a shared queue until it is empty, reusing the same session.
+    Posts from every worker are merged and deduplicated with post_key.
+    """
+
+    def __init__(self, credentials: List[tuple], workers: int = 2, chromedriver_path: str = "auto",
+                 max_posts: int = 50, scroll_limit: int = 10, extraction: str = "html",
+                 profile_root: Optional[str] = None):
+        self.credentials = queue.Queue()
+        for credential in credentials:
+            self.credentials.put(credential)
+        self.workers = max(1, min(workers, len(credentials)))
+        # Resolve ChromeDriver once instead of once per browser
+        if chromedriver_path == "auto":
+            chromedriver_path = FacebookScraper._find_chromedriver()
+        self.chromedriver_path = chromedriver_path
+        self.max_posts = max_posts
+        self.scroll_limit = scroll_limit
+        self.extraction = extraction
+        self.profile_root = profile_root
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.posts: List[FacebookPost] = []
+        self.seen = set()
+        self.stats: List[WorkerStats] = []
+
+    def _login(self, scraper: FacebookScraper, stats: WorkerStats) -> bool:
+        while True:
+            try:
+                email, password = self.credentials.get_nowait()
+            except queue.Empty:
+                return False
+            if scraper.login(email, password):
+                stats.account = email
+                return True
+            logger.warning(f"[{stats.worker}] Login failed with {email}")
+
+    def _merge(self, url: str, posts: List[FacebookPost]) -> int:
+        new = 0
+        with self.lock:
+            for post in posts:
+                key = post_key(post)
+                if key in self.seen:
+                    continue
+                self.seen.add(key)
+                post.source_url = url
+                self.posts.append(post)
+                new += 1
+        return new
+
+    def _worker(self, index: int, urls: queue.Queue):
+        stats = WorkerStats(f"worker-{index}")
+        with self.lock:
+            self.stats.append(stats)
+
+        start = time.perf_counter()
+        try:
+            # One profile directory per worker: Chrome locks the one it uses
+            profile_dir = os.path.join(self.profile_root, f"worker-{index}") if self.profile_root else None
+            scraper = FacebookScraper(chromedriver_path=self.chromedriver_path, headless=True,
+                                      profile_dir=profile_dir)
+            scraper.stop_event = self.stop
+        except Exception as e:
+            logger.error(f"[{stats.worker}] Could not start a browser: {e}")
+            return
+        try:
+            if not self._login(scraper, stats):
+                logger.error(f"[{stats.worker}] No account left to log in, worker stopped")
+                return
+            stats.startup_seconds = time.perf_counter() - start
+
+            while not self.stop.is_set():
+                try:
+                    url = urls.get_nowait()
+                except queue.Empty:
+                    break
+                url_start = time.perf_counter()
+                try:
+                    posts = scraper.scrape_search_results(url, self.max_posts, self.scroll_limit,
+                                                          self.extraction)
+                except Exception as e:
+                    stats.failed_urls += 1
+                    logger.warning(f"[{stats.worker}] Failed on {url}: {e}")
+                    continue
+                finally:
+                    stats.busy_seconds += time.perf_counter() - url_start
+                if scraper.last_error is not None:
+                    # Partial results are still merged below
+                    stats.failed_urls += 1
+                    logger.warning(f"[{stats.worker}] Failed on {url} after {len(posts)} posts: "
+                                   f"{scraper.last_error}")
+                stats.urls += 1
+                stats.posts += len(posts)
+                if scraper.metrics.pages:
+                    stats.bytes += scraper.metrics.pages[-1]['bytes']
+                new = self._merge(url, posts)
+                stats.new_posts += new
+                logger.info(f"[{stats.worker}] {url}: {len(posts)} posts ({new} new), "
+                            f"{urls.qsize()} URLs left")
+        finally:
+            scraper.close()
+
+    def run(self, urls: List[str]) -> List[FacebookPost]:
+        """Scrape every URL, return the merged unique posts"""
+        pending = queue.Queue()
+        for url in urls:
+            pending.put(url)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=self._worker, args=(i, pending), name=f"worker-{i}")
+                   for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            # Let the workers finish their current scroll and close their browsers
+            logger.info("Interrupted: stopping the workers")
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+            raise
+        elapsed = time.perf_counter() - start
+
+        for stats in sorted(self.stats, key=lambda s: s.worker):
+            logger.info(f"{stats.worker} ({stats.account or 'not logged in'}): {stats.urls} URLs, "
+                        f"{stats.failed_urls} failed, {stats.posts} posts ({stats.new_posts} new), "
+                        f"{stats.bytes / 2**20:.1f} MiB, "
+                        f"startup {stats.startup_seconds:.1f}s, busy {stats.busy_seconds:.1f}s, "
+                        f"{stats.posts_per_minute:.1f} posts/min")
+        logger.info(f"Pool: {len(urls)} URLs, {len(self.posts)} unique posts in {elapsed:.1f}s "
+                    f"with {self.workers} workers")
+        if not pending.empty():
+            reason = "run stopped" if self.stop.is_set() else "no worker logged in"
+            logger.warning(f"{pending.qsize()} URLs were not scraped ({reason})")
+        return self.snapshot()
+
+    def snapshot(self) -> List[FacebookPost]:
+        """Copy of the merged posts, safe while workers are running"""
+        with self.lock:
+            return list(self.posts)
+
+
 def main():
     """Main function with CLI interface"""
     parser = argparse.ArgumentParser(description="Improved Facebook Scraper")
-    parser.add_argument('-u', '--url', required=True, 
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('-u', '--url',
                         help='Facebook URL to scrape (page or search results)')
+    source.add_argument('--urls-file',
+                        help='File with one page or search URL per line, scraped by a pool of headless browsers')
+    source.add_argument('--parse-html',
+                        help='Parse a saved page (HTML file) offline, without a browser')
+    parser.add_argument('-w', '--workers', type=int, default=2,
+                        help='Browsers in the pool with --urls-file, one account each (default: 2)')
     parser.add_argument('-n', '--num-posts', type=int, default=50,
                         help='Maximum number of posts to scrape (default: 50)')
     parser.add_argument('-o', '--output', choices=['csv', 'json', 'txt'], default='csv',
@@ -593,13 +894,28 @@ def main():
                         help='Path to chromedriver executable')
     parser.add_argument('--credentials_file', default='credentials.txt',
                     help='Path to credentials file (default: credentials.txt)')
+    parser.add_argument('--profile-dir', default='chrome_profile_fb',
+                        help='Persistent Chrome profile (one sub-directory per worker with --urls-file)')
+    parser.add_argument('--extraction', choices=['html', 'live'], default='html',
+                        help='html: parse page_source once per scroll; live: WebDriver calls per field')
 
     
     args = parser.parse_args()
+
+    if args.urls_file:
+        run_pool(args)
+        return
+    if args.parse_html:
+        with open(args.parse_html, 'r', encoding='utf-8') as f:
+            posts = PostParser().parse(f.read())
+        FacebookScraper.save_data(posts, args.output, args.filename)
+        logger.info(f"Parsed {len(posts)} posts from {args.parse_html}")
+        return
     
     scraper = FacebookScraper(
         chromedriver_path=args.chromedriver if args.chromedriver else "auto",
-        headless=args.headless
+        headless=args.headless,
+        profile_dir=args.profile_dir
     )
 
     credentials_list = load_credentials_from_file(args.credentials_file)
@@ -613,7 +929,7 @@ def main():
             logger.error("Could not login with any provided credentials.")
             return
 
-        posts = scraper.scrape_search_results(args.url, args.num_posts)
+        posts = scraper.scrape_search_results(args.url, args.num_posts, extraction=args.extraction)
         scraper.save_data(posts, args.output, args.filename)
         logger.info(f"Successfully scraped {len(posts)} posts")
 
@@ -625,5 +941,28 @@ def main():
         scraper.close()
 
 
+def run_pool(args):
+    """--urls-file mode: every URL of the file through a ScraperPool"""
+    credentials_list = load_credentials_from_file(args.credentials_file)
+    if not credentials_list:
+        logger.error("No credentials loaded. Please check your credentials file.")
+        return
+    urls = load_urls_from_file(args.urls_file)
+    if not urls:
+        logger.error(f"No URL found in {args.urls_file}")
+        return
+
+    pool = ScraperPool(credentials_list, workers=args.workers,
+                       chromedriver_path=args.chromedriver or "auto", max_posts=args.num_posts,
+                       extraction=args.extraction, profile_root=args.profile_dir)
+    try:
+        posts = pool.run(urls)
+    except KeyboardInterrupt:
+        logger.info("Scraping interrupted by user")
+        posts = pool.snapshot()
+    FacebookScraper.save_data(posts, args.output, args.filename)
+    logger.info(f"Successfully scraped {len(posts)} posts from {len(urls)} URLs")
+
+
 if __name__ == "__main__":
     main()
@@ -1,9 +1,177 @@
 #author: artemis
-import pandas as pd
+"""
+Streaming merge of the scraped CSV files into uvb_all.csv.
+
+Each source is read in chunks directly in the canonical schema of
+ingestion.py (Author, Tweet, Date, ..., Source). Duplicates are removed with
+a compact, sorted array of 64-bit row hashes instead of one pd.concat +
+drop_duplicates over the whole corpus, so memory stays flat whatever the
+size of the archive. The hash array can be persisted between runs to merge
+only new rows into an existing output.
+
+An existing output is never rewritten by default: new rows are appended to
+it (uvb_all.csv holds tweets that no other file has). --overwrite rebuilds it
+from the sources only.
+
+    python fusioner.py                                  # *.csv -> uvb_all.csv (append)
+    python fusioner.py -i "tweets_*.csv" -e "old_*.csv" --state uvbf_hashes.npy
+"""
+import argparse
+import fnmatch
 import glob
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from ingestion import CANONICAL_COLUMNS, coerce_canonical, read_header, read_source
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = "uvb_all.csv"
+# Outputs of the previous merge scripts, never re-ingested by default
+DEFAULT_EXCLUDE = ["uvbf_data.csv"]
+
+
+def resolve_sources(include, exclude, output):
+    """Expand include globs, drop excluded patterns and the output file itself"""
+    files = []
+    for pattern in include:
+        for path in sorted(glob.glob(pattern)):
+            if path not in files:
+                files.append(path)
+
+    output_abs = os.path.abspath(output)
+    return [
+        path for path in files
+        if os.path.abspath(path) != output_abs
+        and not any(fnmatch.fnmatch(os.path.basename(path), pat) or fnmatch.fnmatch(path, pat)
+                    for pat in exclude)
+    ]
+
+
+def iter_chunks(path, columns, chunksize):
+    """Read a source in the canonical schema, aligned on the output columns"""
+    for chunk in read_source(path, chunksize=chunksize):
+        yield chunk.reindex(columns=columns)
+
+
+def row_hashes(chunk, key_columns=None):
+    """
+    64-bit hash of each row (or of key_columns only). Rows are coerced to the
+    canonical dtypes first, so a row hashes the same whether it comes from a
+    source or is read back from the output with dtype=str.
+    """
+    frame = coerce_canonical(chunk[key_columns] if key_columns else chunk)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+class HashSet:
+    """Sorted uint64 array used as a compact set of row hashes (8 bytes/row)"""
+
+    def __init__(self, hashes=None):
+        self.hashes = np.empty(0, dtype=np.uint64) if hashes is None else np.sort(hashes)
+
+    @classmethod
+    def load(cls, path):
+        if path and os.path.exists(path):
+            return cls(np.load(path))
+        return cls()
+
+    def save(self, path):
+        np.save(path, self.hashes)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def filter_new(self, hashes):
+        """Mask of rows whose hash was never seen, keeping the first of in-chunk duplicates"""
+        _, first = np.unique(hashes, return_index=True)
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[first] = True
+
+        if len(self.hashes):
+            pos = np.searchsorted(self.hashes, hashes)
+            pos[pos == len(self.hashes)] = 0
+            keep &= self.hashes[pos] != hashes
+
+        if keep.any():
+            self.hashes = np.union1d(self.hashes, hashes[keep])
+        return keep
+
+
+def merge(sources, output, chunksize=100_000, key_columns=None, state=None, append=None):
+    """
+    Stream sources into output, writing only rows not seen before. With
+    append=None (default), an existing output is appended to, never truncated.
+    """
+    if append is None:
+        append = os.path.exists(output)
+    seen = HashSet.load(state)
+
+    if append and os.path.exists(output):
+        columns = read_header(output)
+        write_header = False
+        if not len(seen):
+            # No saved state: rebuild the hashes from the existing output
+            for chunk in pd.read_csv(output, dtype=str, chunksize=chunksize):
+                seen.filter_new(row_hashes(chunk, key_columns))
+    else:
+        columns = CANONICAL_COLUMNS
+        write_header = True
+
+    stats = {'read': 0, 'written': 0}
+    with open(output, 'a' if append else 'w', encoding='utf-8', newline='') as out:
+        for path in sources:
+            read = written = 0
+            for chunk in iter_chunks(path, columns, chunksize):
+                keep = seen.filter_new(row_hashes(chunk, key_columns))
+                new_rows = chunk[keep]
+                new_rows.to_csv(out, header=write_header, index=False)
+                write_header = False
+                read += len(chunk)
+                written += len(new_rows)
+
+            logger.info(f"{path}: {read} rows read, {written} new")
+            stats['read'] += read
+            stats['written'] += written
+
+    if state:
+        seen.save(state)
+    logger.info(f"Merged {len(sources)} files into {output}: {stats['read']} rows read, "
+                f"{stats['written']} written, {len(seen)} unique hashes")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming, deduplicated merge of scraped CSV files")
+    parser.add_argument('-i', '--include', nargs='+', default=['*.csv'],
+                        help='Glob patterns of the files to merge (default: *.csv)')
+    parser.add_argument('-e', '--exclude', nargs='*', default=DEFAULT_EXCLUDE,
+                        help='File patterns to skip (default: uvbf_data.csv; '
+                             'the output file is always skipped)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT,
+                        help=f'Merged output file (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--chunksize', type=int, default=100_000,
+                        help='Rows read per chunk (default: 100000)')
+    parser.add_argument('--key', nargs='*', default=None,
+                        help='Deduplicate on these columns only (default: whole row)')
+    parser.add_argument('--state',
+                        help='.npy file where row hashes are kept between runs')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Rewrite the output from the sources only (default: append new rows '
+                             'to an existing output)')
+    args = parser.parse_args()
+
+    sources = resolve_sources(args.include, args.exclude, args.output)
+    if not sources:
+        logger.error("No CSV file to merge")
+        return
+    merge(sources, args.output, chunksize=args.chunksize, key_columns=args.key,
+          state=args.state, append=False if args.overwrite else None)
+
 
-chemin = "*.csv"  
-fichiers = glob.glob(chemin)
-df_combine = pd.concat([pd.read_csv(f) for f in fichiers], ignore_index=True)
-df_combine.drop_duplicates(inplace=True)
-df_combine.to_csv("uvbf_data.csv", index=False)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Schema-normalizing reader for every scraper output.
+
+Maps the columns of each source (Selenium tweet scraper, twikit scraper,
+FacebookPost export, legacy Facebook export with Auteur/Texte) to one
+canonical schema while reading: unused columns are never loaded
+(usecols), every column gets an explicit dtype, and sources that use
+several names for the same field are combined on the fly. This replaces
+the read-modify-write passes of correcter.py and header.py.
+"""
+import pandas as pd
+
+from engagement_counts import parse_counts
+
+# Canonical schema shared by all sources, in output order
+CANONICAL_DTYPES = {
+    'Author': 'string',
+    'Tweet': 'string',
+    'Date': 'string',
+    'Link': 'string',
+    'Images': 'string',
+    'Retweets': 'Int64',
+    'Replies': 'Int64',
+    'Likes': 'Int64',
+    'Source': 'string',
+}
+CANONICAL_COLUMNS = list(CANONICAL_DTYPES)
+# Engagement counts: labels such as "1,2 k" are parsed to integers (missing stays <NA>)
+COUNT_COLUMNS = ['Retweets', 'Replies', 'Likes']
+
+# Source column -> canonical column, per source
+SCHEMAS = {
+    # scrapper.py (Selenium)
+    'twitter_selenium': {
+        'Author': 'Author', 'Tweet': 'Tweet', 'Date': 'Date', 'Link': 'Link',
+        'Images': 'Images', 'Retweets': 'Retweets', 'Replies': 'Replies', 'Likes': 'Likes',
+    },
+    # tweet_kit.py (twikit)
+    'twikit': {
+        'user_screen_name': 'Author', 'text': 'Tweet', 'created_at': 'Date',
+        'retweet_count': 'Retweets', 'reply_count': 'Replies', 'favorite_count': 'Likes',
+    },
+    # fb_scraping.py (FacebookPost)
+    'facebook': {
+        'author': 'Author', 'text': 'Tweet', 'timestamp': 'Date', 'link': 'Link',
+        'image_url': 'Images', 'shares_count': 'Retweets', 'comments_count': 'Replies',
+        'likes_count': 'Likes',
+    },
+    # Old Facebook export, and merged files that mix it with the tweets
+    'facebook_legacy': {
+        'Author': 'Author', 'Auteur': 'Author', 'Tweet': 'Tweet', 'Texte': 'Tweet',
+        'Date': 'Date', 'Link': 'Link', 'Images': 'Images', 'Retweets': 'Retweets',
+        'Replies': 'Replies', 'Likes': 'Likes',
+    },
+}
+
+# Columns that identify a source; checked in order
+SIGNATURES = [
+    ('twikit', {'text', 'user_screen_name'}),
+    ('facebook', {'text', 'author', 'likes_count'}),
+    ('facebook_legacy', {'Auteur'}),
+    ('facebook_legacy', {'Texte'}),
+    ('twitter_selenium', {'Author', 'Tweet'}),
+]
+
+
+def read_header(path):
+    return pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns.tolist()
+
+
+def detect_source(columns):
+    columns = set(columns)
+    for source, signature in SIGNATURES:
+        if signature <= columns:
+            return source
+    raise ValueError(f"Unknown source schema: {sorted(columns)}")
+
+
+def normalize(frame, mapping, source):
+    """Rename a raw frame to the canonical schema, combining aliased columns"""
+    out = pd.DataFrame(index=frame.index)
+    for canonical in CANONICAL_COLUMNS:
+        sources = [col for col, target in mapping.items() if target == canonical and col in frame]
+        if not sources:
+            out[canonical] = pd.Series(pd.NA, index=frame.index, dtype='string')
+        elif len(sources) == 1:
+            out[canonical] = frame[sources[0]]
+        else:
+            # e.g. Author + Auteur: same field under two names, joined like correcter.py did
+            joined = frame[sources[0]].fillna('')
+            for col in sources[1:]:
+                joined = joined + ' ' + frame[col].fillna('')
+            joined = joined.str.strip()
+            out[canonical] = joined.where(joined != '', pd.NA)
+    out['Source'] = source
+    for column in COUNT_COLUMNS:
+        out[column] = parse_counts(out[column], missing=None)
+    return out.astype(CANONICAL_DTYPES)
+
+
+def coerce_canonical(frame):
+    """Canonical dtypes for a frame already in the canonical schema (e.g. read back with dtype=str)"""
+    frame = frame.astype('string')
+    for column in COUNT_COLUMNS:
+        if column in frame:
+            frame[column] = parse_counts(frame[column], missing=None)
+    return frame
+
+
+def read_source(path, source=None, chunksize=None):
+    """
+    Read a scraper output directly in the canonical schema.
+
+    Returns a DataFrame, or an iterator of DataFrames when chunksize is set.
+    """
+    header = read_header(path)
+    source = source or detect_source(header)
+    mapping = SCHEMAS[source]
+    usecols = [col for col in header if col in mapping]
+
+    reader = pd.read_csv(path, usecols=usecols, dtype=str, encoding='utf-8-sig',
+                         chunksize=chunksize)
+    if chunksize is None:
+        return normalize(reader, mapping, source)
+    return (normalize(chunk, mapping, source) for chunk in reader)
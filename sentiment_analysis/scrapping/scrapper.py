@@ -1,18 +1,26 @@
 #author artemis37
-import time
-import random
+import json
+import os
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager as CM
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from dateutil.parser import parse
 
+from driver_factory import PageMetrics, create_driver
+from engagement_counts import parse_counts
+from scroll_control import ScrollController
+
+# Chrome profile kept between runs, so the X session survives restarts
+PROFILE_DIR = "chrome_profile_x"
+
+# --- Session saved in the Chrome profile? ---
+def has_session(driver):
+    driver.get("https://x.com/home")
+    return driver.get_cookie("auth_token") is not None
+
 # --- Login function ---
 def login_twitter(driver, username_str, password_str):
     driver.get("https://x.com/i/flow/login")
@@ -47,81 +55,230 @@ def get_engagement(tweet, label):
     except NoSuchElementException:
         return "0"
 
+# --- Batch extraction: every visible tweet in one execute_script call ---
+# Articles whose status URL was already extracted are skipped in the page,
+# before anything is read; the set lives in window.__scrapedStatus and is
+# seeded from Python after a page load.
+EXTRACT_TWEETS_JS = """
+const seen = window.__scrapedStatus || (window.__scrapedStatus = new Set(arguments[0] || []));
+const textOf = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText.trim() : '';
+};
+const records = [];
+for (const article of document.querySelectorAll('article[data-testid="tweet"]')) {
+    const time = article.querySelector('time');
+    const statusLink = time ? time.closest('a[href*="/status/"]') : null;
+    const status = statusLink ? statusLink.href : '';
+    if (status) {
+        if (seen.has(status)) continue;
+        seen.add(status);
+    }
+    const profile = article.querySelector('a[href*="/"]');
+    const anchor = article.querySelector('a[aria-label][dir]');
+    records.push({
+        status: status,
+        author: profile ? profile.href.split('/').pop() : '',
+        text: textOf(article, 'div[lang]'),
+        datetime: time ? time.getAttribute('datetime') : '',
+        link: anchor ? anchor.href : '',
+        images: Array.from(article.querySelectorAll('div[data-testid="tweetPhoto"] img'), img => img.src),
+        retweets: textOf(article, 'div[data-testid="retweet"]'),
+        replies: textOf(article, 'div[data-testid="reply"]'),
+        likes: textOf(article, 'div[data-testid="like"]'),
+    });
+}
+return records;
+"""
+
+def tweet_date(timestamp):
+    try:
+        return parse(timestamp).date().isoformat()
+    except Exception:
+        return ""
+
+def extract_visible_tweets(driver, seen_status, seed=False, with_status=False):
+    """
+    Tuples for the visible tweets not in seen_status (one WebDriver round trip),
+    or (status URL, tuple) pairs with with_status=True
+    """
+    records = driver.execute_script(EXTRACT_TWEETS_JS, sorted(seen_status) if seed else None)
+    rows = []
+    for record in records:
+        if record['status']:
+            seen_status.add(record['status'])
+        images_links = ', '.join(record['images']) if record['images'] else "No Images"
+        row = (record['author'], record['text'], tweet_date(record['datetime']), record['link'],
+               images_links, record['retweets'] or "0", record['replies'] or "0", record['likes'] or "0")
+        rows.append((record['status'], row) if with_status else row)
+    return rows
+
+# --- Per-element extraction (one WebDriver call per field) ---
+def extract_tweets_elements(driver):
+    rows = []
+    tweets = driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
+
+    for tweet in tweets:
+        try:
+            profile_link = tweet.find_element(By.CSS_SELECTOR, 'a[href*="/"]')
+            author = profile_link.get_attribute("href").split("/")[-1]
+        except NoSuchElementException:
+            author = ""
+
+        try:
+            tweet_text = tweet.find_element(By.CSS_SELECTOR, 'div[lang]').text
+        except NoSuchElementException:
+            tweet_text = ""
+
+        try:
+            timestamp = tweet.find_element(By.TAG_NAME, "time").get_attribute("datetime")
+            tweet_date_str = parse(timestamp).date().isoformat()
+        except Exception:
+            tweet_date_str = ""
+
+        try:
+            anchor = tweet.find_element(By.CSS_SELECTOR, "a[aria-label][dir]")
+            external_link = anchor.get_attribute("href")
+        except Exception:
+            external_link = ""
+
+        try:
+            images = tweet.find_elements(By.CSS_SELECTOR, 'div[data-testid="tweetPhoto"] img')
+            tweet_images = [img.get_attribute("src") for img in images]
+        except Exception:
+            tweet_images = []
+
+        images_links = ', '.join(tweet_images) if tweet_images else "No Images"
+
+        retweets = get_engagement(tweet, "retweet")
+        replies = get_engagement(tweet, "reply")
+        likes = get_engagement(tweet, "like")
+
+        rows.append((author, tweet_text, tweet_date_str, external_link, images_links, retweets, replies, likes))
+    return rows
+
+COLUMNS = ["Author", "Tweet", "Date", "Link", "Images", "Retweets", "Replies", "Likes"]
+
+# --- Append-only checkpoint file (one JSON record per line) ---
+# A checkpoint only writes the tweets collected since the previous one
+# (fsync'd), instead of rewriting the whole CSV. On startup the file is read
+# back to rebuild the dedup set and the status URLs to skip, so a crashed run
+# resumes without rescraping. A last line without a newline (a write cut by
+# the crash) is dropped; a corrupt line elsewhere is skipped with a warning
+# and the records after it are kept.
+class JsonlSink:
+    def __init__(self, path):
+        self.path = path
+        self.rows = []
+        self.collected = set()
+        self.seen_status = set()
+        self.pending = []
+        if os.path.exists(path):
+            self._load()
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        complete_bytes = 0
+        skipped = 0
+        with open(self.path, 'rb') as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith(b'\n'):
+                    break
+                complete_bytes += len(line)
+                try:
+                    record = json.loads(line)
+                    row = tuple(record[column] for column in COLUMNS)
+                except (ValueError, KeyError, TypeError) as e:
+                    skipped += 1
+                    print(f"Warning: skipping corrupt record on line {number} of {self.path}: {e}")
+                    continue
+                if row not in self.collected:
+                    self.collected.add(row)
+                    self.rows.append(row)
+                if record.get("Status"):
+                    self.seen_status.add(record["Status"])
+        if skipped:
+            print(f"Warning: {skipped} corrupt records skipped in {self.path}")
+        if complete_bytes < os.path.getsize(self.path):
+            print(f"Dropping a truncated record at the end of {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete_bytes)
+
+    def add(self, row, status=""):
+        if status:
+            self.seen_status.add(status)
+        if row in self.collected:
+            return False
+        self.collected.add(row)
+        self.rows.append(row)
+        self.pending.append(dict(zip(COLUMNS, row), Status=status))
+        return True
+
+    def flush(self):
+        """Append the records added since the last flush, return how many"""
+        if not self.pending:
+            return 0
+        self.file.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self.pending))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        written = len(self.pending)
+        self.pending = []
+        return written
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
 # --- Scroll and collect tweets ---
-def scroll_and_collect_tweets(driver, max_scrolls=50, scroll_pause=5, output_file="tweets_UVBF.csv"):
-    tweets_collected = set()
-    tweets_data = []
+# scroll_pause is the longest wait for new tweets after a scroll; the
+# controller usually returns much earlier, then pauses 1-3s (+ latency / 2)
+def scroll_and_collect_tweets(driver, max_scrolls=50, scroll_pause=15, output_file="tweets_UVBF.csv", batch=True,
+                              checkpoint_file=None, checkpoint_every=1):
+    checkpoint_file = checkpoint_file or os.path.splitext(output_file)[0] + ".jsonl"
+    sink = JsonlSink(checkpoint_file)
+    if sink.rows:
+        print(f"Resuming from {checkpoint_file}: {len(sink.rows)} tweets already collected")
+    seen_status = set(sink.seen_status)
     scroll_count = 0
-    last_height = driver.execute_script("return document.body.scrollHeight")
-
-    while scroll_count < max_scrolls:
-        tweets = driver.find_elements(By.CSS_SELECTOR, 'article[data-testid="tweet"]')
-
-        for tweet in tweets:
-            try:
-                profile_link = tweet.find_element(By.CSS_SELECTOR, 'a[href*="/"]')
-                author = profile_link.get_attribute("href").split("/")[-1]
-            except NoSuchElementException:
-                author = ""
-
-            try:
-                tweet_text = tweet.find_element(By.CSS_SELECTOR, 'div[lang]').text
-            except NoSuchElementException:
-                tweet_text = ""
-
-            try:
-                timestamp = tweet.find_element(By.TAG_NAME, "time").get_attribute("datetime")
-                tweet_date = parse(timestamp).date().isoformat()
-            except Exception:
-                tweet_date = ""
-
-            try:
-                anchor = tweet.find_element(By.CSS_SELECTOR, "a[aria-label][dir]")
-                external_link = anchor.get_attribute("href")
-            except Exception:
-                external_link = ""
-
-            try:
-                images = tweet.find_elements(By.CSS_SELECTOR, 'div[data-testid="tweetPhoto"] img')
-                tweet_images = [img.get_attribute("src") for img in images]
-            except Exception:
-                tweet_images = []
-
-            images_links = ', '.join(tweet_images) if tweet_images else "No Images"
-
-            retweets = get_engagement(tweet, "retweet")
-            replies = get_engagement(tweet, "reply")
-            likes = get_engagement(tweet, "like")
-
-            tweet_tuple = (author, tweet_text, tweet_date, external_link, images_links, retweets, replies, likes)
-            if tweet_tuple not in tweets_collected:
-                tweets_collected.add(tweet_tuple)
-                tweets_data.append(tweet_tuple)
-                print(f"Author: {author}, Date: {tweet_date}, Tweet: {tweet_text[:50]}...")
-
-        # Scroll to bottom with randomized delay
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(scroll_pause + random.uniform(1, 3))
-
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            print("Reached bottom or no new tweets loaded.")
-            break
-        last_height = new_height
-        scroll_count += 1
-
-        # Save incrementally every 10 scrolls
-        if scroll_count % 10 == 0:
-            print(f"Saving data after {scroll_count} scrolls...")
-            save_to_csv(tweets_data, output_file)
+    controller = ScrollController(driver, 'article[data-testid="tweet"]', max_timeout=scroll_pause)
 
+    try:
+        while scroll_count < max_scrolls:
+            with controller.extracting():
+                if batch:
+                    rows = extract_visible_tweets(driver, seen_status, seed=scroll_count == 0, with_status=True)
+                else:
+                    rows = [("", row) for row in extract_tweets_elements(driver)]
+
+            for status, tweet_tuple in rows:
+                if sink.add(tweet_tuple, status):
+                    print(f"Author: {tweet_tuple[0]}, Date: {tweet_tuple[2]}, Tweet: {tweet_tuple[1][:50]}...")
+
+            # Scroll to bottom and wait until new tweets are loaded
+            if not controller.scroll():
+                print("Reached bottom or no new tweets loaded.")
+                break
+            scroll_count += 1
+
+            # Append the new tweets to the checkpoint file
+            if scroll_count % checkpoint_every == 0:
+                written = sink.flush()
+                if written:
+                    print(f"Checkpoint after {scroll_count} scrolls: +{written} tweets ({len(sink.rows)} total)")
+    finally:
+        sink.close()
+
+    print(f"{controller.summary()} [{'batch' if batch else 'per-element'} extraction]")
     # Final save
-    save_to_csv(tweets_data, output_file)
-    return tweets_data
+    save_to_csv(sink.rows, output_file)
+    return sink.rows
 
 # --- Save to CSV ---
 def save_to_csv(data, filename):
-    df = pd.DataFrame(data, columns=["Author", "Tweet", "Date", "Link", "Images", "Retweets", "Replies", "Likes"])
+    df = pd.DataFrame(data, columns=COLUMNS)
+    # "1,2 k" / "1.2K" -> 1200
+    for column in ("Retweets", "Replies", "Likes"):
+        df[column] = parse_counts(df[column])
     df.to_csv(filename, index=False, encoding='utf-8-sig')
     print(f"Saved {len(data)} tweets to {filename}")
 
@@ -134,27 +291,29 @@ def main():
     search_query = '%28%22CITADEL%20UVBF%22%20OR%20%22Citadel%20UVBF%22%20OR%20%22Citadelle%20UVBF%22%20OR%20citadel_uvbf%20OR%20%23citadel_uvbf%29'
     search_url = f"https://x.com/search?q={search_query}&f=live"
 
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_argument("--headless")  # Comment this out if you want to see the browser
-
-    service = Service(executable_path=CM().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    # Minimal headless profile: media, fonts, images and trackers are blocked
+    driver = create_driver(headless=True, profile_dir=PROFILE_DIR)  # headless=False to see the browser
+    metrics = PageMetrics(driver)
 
     output_file = "tweets_UVBF_final.csv"
 
     try:
-        if not login_twitter(driver, username_str, password_str):
+        if has_session(driver):
+            print("Reusing the session saved in the Chrome profile.")
+        elif not login_twitter(driver, username_str, password_str):
             driver.quit()
             return
+        metrics.collect("login")
 
         driver.get(search_url)
         WebDriverWait(driver, 30).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, 'article[data-testid="tweet"]'))
         )
 
-        tweets_data = scroll_and_collect_tweets(driver, max_scrolls=100, scroll_pause=5, output_file=output_file)
+        print(PageMetrics.describe(metrics.collect("search page")))
+
+        tweets_data = scroll_and_collect_tweets(driver, max_scrolls=100, scroll_pause=15, output_file=output_file)
+        print(PageMetrics.describe(metrics.collect("scrolling")))
 
         print(f"Total tweets collected: {len(tweets_data)}")
         print(f"Final data saved to {output_file}")
@@ -0,0 +1,176 @@
+#author: artemis
+"""
+Adaptive scrolling shared by the Selenium scrapers (scrapper.py, fb_scraping.py).
+
+Instead of sleeping a fixed time after each scroll, ScrollController scrolls
+to the bottom and waits inside the page (one execute_async_script call with
+a MutationObserver) until more items match the selector or the page grew,
+up to a timeout:
+
+- the wait timeout follows the observed load latency (moving average), so
+  the end of a feed is detected quickly; before giving up, one last wait
+  uses the full `max_timeout` in case the network is just slow;
+- a random pause (`jitter` seconds, plus half the usual latency) is kept
+  after every scroll so the request rate stays polite;
+- time spent waiting and time spent extracting are accumulated per run.
+
+    controller = ScrollController(driver, 'article[data-testid="tweet"]')
+    while True:
+        with controller.extracting():
+            rows = extract(driver)
+        if not controller.scroll():
+            break
+    print(controller.summary())
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Scrolls to the bottom, then calls back [count, height, elapsed_ms, loaded] as
+# soon as there are more items or a taller page, or after timeoutMs
+SCROLL_AND_WAIT_JS = """
+const [selector, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const count = () => document.querySelectorAll(selector).length;
+const height = () => document.body.scrollHeight;
+const start = performance.now();
+const previousCount = count();
+const previousHeight = height();
+const grew = () => count() > previousCount || height() > previousHeight;
+let finished = false;
+let observer = null;
+let timer = null;
+const finish = (loaded) => {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(timer);
+    done([count(), height(), performance.now() - start, loaded]);
+};
+window.scrollTo(0, document.body.scrollHeight);
+if (grew()) {
+    finish(true);
+} else {
+    observer = new MutationObserver(() => { if (grew()) finish(true); });
+    observer.observe(document.body, {childList: true, subtree: true});
+    timer = setTimeout(() => finish(grew()), timeoutMs);
+}
+"""
+
+# Waits for at least one item (first load of a page)
+WAIT_FOR_ITEMS_JS = """
+const [selector, timeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+if (document.querySelector(selector)) {
+    done(0);
+} else {
+    const observer = new MutationObserver(() => {
+        if (document.querySelector(selector)) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(performance.now() - start);
+        }
+    });
+    const timer = setTimeout(() => { observer.disconnect(); done(null); }, timeoutMs);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+}
+"""
+
+
+class ScrollController:
+    def __init__(self, driver, selector, max_timeout=15.0, min_timeout=1.0, jitter=(1.0, 3.0),
+                 smoothing=0.3, initial_latency=2.0):
+        self.driver = driver
+        self.selector = selector
+        self.max_timeout = max_timeout
+        self.min_timeout = min_timeout
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self.latency = initial_latency
+        self.driver.set_script_timeout(max_timeout + 5)
+        self.reset()
+
+    def reset(self):
+        """Start a new run: clear the counters (the latency estimate is kept)"""
+        self.scrolls = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.pause_seconds = 0.0
+        self.extract_seconds = 0.0
+        self.started = time.perf_counter()
+
+    @property
+    def timeout(self):
+        """Current wait for new content: 4x the usual latency, within [min_timeout, max_timeout]"""
+        return min(self.max_timeout, max(self.min_timeout, 4 * self.latency))
+
+    def _observe(self, seconds):
+        self.latency += self.smoothing * (seconds - self.latency)
+
+    def _scroll_and_wait(self, timeout):
+        start = time.perf_counter()
+        count, height, elapsed_ms, loaded = self.driver.execute_async_script(
+            SCROLL_AND_WAIT_JS, self.selector, int(timeout * 1000))
+        self.wait_seconds += time.perf_counter() - start
+        return loaded, elapsed_ms / 1000
+
+    def scroll(self, timeout=None):
+        """Scroll to the bottom and wait for new content; False at the end of the feed"""
+        self.scrolls += 1
+        loaded, seconds = self._scroll_and_wait(timeout or self.timeout)
+        if not loaded and not timeout and self.timeout < self.max_timeout:
+            # Maybe just a slow response: one last chance with the full timeout
+            loaded, seconds = self._scroll_and_wait(self.max_timeout)
+        if not loaded:
+            self.timeouts += 1
+            return False
+        self._observe(seconds)
+        self.pause()
+        return True
+
+    def pause(self):
+        """Polite pause between two scrolls: jitter floor plus half the usual latency"""
+        seconds = random.uniform(*self.jitter) + self.latency / 2
+        time.sleep(seconds)
+        self.pause_seconds += seconds
+
+    def wait_for_items(self, timeout=None):
+        """Wait until the page shows at least one item; False on timeout"""
+        start = time.perf_counter()
+        elapsed_ms = self.driver.execute_async_script(
+            WAIT_FOR_ITEMS_JS, self.selector, int((timeout or self.max_timeout) * 1000))
+        self.wait_seconds += time.perf_counter() - start
+        if elapsed_ms is None:
+            return False
+        self._observe(elapsed_ms / 1000)
+        return True
+
+    @contextmanager
+    def extracting(self):
+        """Count the time of the enclosed block as extraction time"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.extract_seconds += time.perf_counter() - start
+
+    def report(self):
+        return {
+            'scrolls': self.scrolls,
+            'timeouts': self.timeouts,
+            'wait_seconds': round(self.wait_seconds, 2),
+            'pause_seconds': round(self.pause_seconds, 2),
+            'extract_seconds': round(self.extract_seconds, 2),
+            'total_seconds': round(time.perf_counter() - self.started, 2),
+            'latency_seconds': round(self.latency, 3),
+        }
+
+    def summary(self):
+        r = self.report()
+        return (f"{r['scrolls']} scrolls in {r['total_seconds']}s: waiting {r['wait_seconds']}s, "
+                f"polite pauses {r['pause_seconds']}s, extracting {r['extract_seconds']}s "
+                f"(load latency ~{r['latency_seconds']}s, {r['timeouts']} timeouts)")
@@ -1,16 +1,44 @@
 #author : artemis37
 import asyncio
 import pandas as pd
-from twikit import Client, TooManyRequests
 import logging
 import time
 import random
 from datetime import datetime
 
+try:
+    from twikit import Client, TooManyRequests
+    TWIKIT_AVAILABLE = True
+except ImportError:
+    TWIKIT_AVAILABLE = False
+
+    class TooManyRequests(Exception):
+        """Stand-in for twikit.TooManyRequests so mock clients work without twikit"""
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columns written for every tweet
+TWEET_FIELDS = ['id', 'text', 'created_at', 'user_screen_name', 'user_name',
+                'retweet_count', 'favorite_count', 'reply_count', 'lang']
+
+
+def tweet_to_row(tweet):
+    """Flatten a twikit Tweet into a dict with TWEET_FIELDS keys"""
+    return {
+        'id': tweet.id,
+        'text': tweet.text,
+        'created_at': tweet.created_at,
+        'user_screen_name': tweet.user.screen_name,
+        'user_name': tweet.user.name,
+        'retweet_count': tweet.retweet_count,
+        'favorite_count': tweet.favorite_count,
+        'reply_count': getattr(tweet, 'reply_count', 0),
+        'lang': getattr(tweet, 'lang', 'unknown')
+    }
+
+
 class TwitterScraper:
     def __init__(self, username, email, password, locale='en-US'):
         self.client = Client(locale)
@@ -68,19 +96,7 @@ class TwitterScraper:
                             if collected_count >= max_tweets:
                                 break
                             
-                            tweet_data = {
-                                'id': tweet.id,
-                                'text': tweet.text,
-                                'created_at': tweet.created_at,
-                                'user_screen_name': tweet.user.screen_name,
-                                'user_name': tweet.user.name,
-                                'retweet_count': tweet.retweet_count,
-                                'favorite_count': tweet.favorite_count,
-                                'reply_count': getattr(tweet, 'reply_count', 0),
-                                'lang': getattr(tweet, 'lang', 'unknown')
-                            }
-                            
-                            self.tweets_data.append(tweet_data)
+                            self.tweets_data.append(tweet_to_row(tweet))
                             collected_count += 1
                             
                             if collected_count % 50 == 0:
@@ -140,6 +156,8 @@ async def main():
     EMAIL = 'YOUR_MAIL@INSECURE.NET'  # Replace with your Twitter email
     PASSWORD = 'DROP_YOUR_PASS'  # Replace with your Twitter password
     
+    # Single serial search; for the full range use twikit_backfill.py, which
+    # shards it into date windows with checkpoints and several accounts
     QUERY = '"Université UVBF" OR UVBF OR #UVBF since:2020-01-01 until:2025-09-01'
     MAX_TWEETS = 5000
     
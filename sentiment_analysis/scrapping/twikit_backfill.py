@@ -0,0 +1,296 @@
+#author: artemis
+"""
+Sharded historical backfill for one twikit search.
+
+Instead of paging through a single `since:2020-01-01 until:2025-09-01`
+search, the range is cut into date windows (`since:`/`until:` shards) that
+run concurrently on the client pool of twikit_scheduler.py:
+
+- every shard has its own cursor in the state file, so a rate limit, a
+  session error or a crash only costs the page in flight; rerunning the same
+  command resumes the unfinished shards and skips the completed ones;
+- after each page the density of the shard is estimated from the dates of
+  the tweets already fetched; when the rest of the window is expected to
+  hold more than --split-threshold tweets, the shard stops and the remaining
+  days are split in two new shards (down to --min-days), so busy periods
+  (rentrée, exams...) are spread over more workers;
+- tweets go through the same CsvSink, deduplicated by id across shards
+  (split points overlap by one day on purpose).
+
+    python twikit_backfill.py --accounts accounts.json --since 2020-01-01 --until 2025-09-01
+    python twikit_backfill.py --mock 4 --since 2020-01-01 --until 2025-09-01   # no network
+"""
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from twikit_scheduler import (DEFAULT_BURST, DEFAULT_PERIOD, DEFAULT_RATE, ClientPool,
+                              CsvSink, CursorStore, MockClient, Query, Scheduler, Slot,
+                              TokenBucket, login_clients)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY = '"Université UVBF" OR UVBF OR #UVBF'
+DATE_FORMAT = '%Y-%m-%d'
+TWITTER_TIME_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+META_KEY = '_backfill'
+
+
+def parse_day(value):
+    return value if isinstance(value, date) else datetime.strptime(value, DATE_FORMAT).date()
+
+
+def day_start(day):
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def tweet_time(tweet):
+    """Creation time of a twikit Tweet (aware datetime), or None if it cannot be parsed"""
+    created = getattr(tweet, 'created_at_datetime', None)
+    if created is not None:
+        return created
+    try:
+        return datetime.strptime(tweet.created_at, TWITTER_TIME_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+def date_windows(since, until, days):
+    """Consecutive [start, end) windows of `days` days covering [since, until), newest first"""
+    windows = []
+    end = until
+    while end > since:
+        start = max(since, end - timedelta(days=days))
+        windows.append((start, end))
+        end = start
+    return windows
+
+
+class Backfill(Scheduler):
+    """Scheduler over date-window shards of one query, splitting the dense ones"""
+
+    def __init__(self, pool, sink, cursors, base_query, split_threshold=1000, min_days=1,
+                 product='Latest', **kwargs):
+        super().__init__(pool, sink, cursors, **kwargs)
+        self.base_query = base_query
+        self.split_threshold = split_threshold
+        self.min_days = min_days
+        self.product = product
+        self.queue = None
+        self.splits = 0
+
+    def shard(self, since, until):
+        """Query for [since, until); its progress entry remembers the window for resuming"""
+        name = f"{since:%Y-%m-%d}_{until:%Y-%m-%d}"
+        progress = self.cursors.get(name)
+        progress.setdefault('since', since.strftime(DATE_FORMAT))
+        progress.setdefault('until', until.strftime(DATE_FORMAT))
+        return Query(name, f"{self.base_query} since:{since:%Y-%m-%d} until:{until:%Y-%m-%d}",
+                     self.product)
+
+    def shards(self):
+        return {name: progress for name, progress in self.cursors.state.items()
+                if name != META_KEY and 'since' in progress}
+
+    def plan(self, since, until, window_days):
+        """Unfinished shards from the state file, or a fresh split of [since, until)"""
+        meta = {'query': self.base_query, 'since': since.strftime(DATE_FORMAT),
+                'until': until.strftime(DATE_FORMAT)}
+        previous = self.cursors.state.get(META_KEY)
+        if previous and previous != meta:
+            raise ValueError(f"State file {self.cursors.path} belongs to another backfill: {previous}")
+        self.cursors.state[META_KEY] = meta
+
+        if self.shards():
+            pending = [self.shard(parse_day(p['since']), parse_day(p['until']))
+                       for p in self.shards().values() if not p['done']]
+        else:
+            pending = [self.shard(start, end) for start, end in date_windows(since, until, window_days)]
+        self.cursors.save()
+        return pending
+
+    def after_page(self, query, progress, items):
+        progress['fetched'] = progress.get('fetched', 0) + len(items)
+        times = [t for t in map(tweet_time, items) if t is not None]
+        if times:
+            oldest = min(times)
+            if not progress.get('oldest') or oldest < datetime.fromisoformat(progress['oldest']):
+                progress['oldest'] = oldest.isoformat()
+        if progress['done'] or not progress.get('oldest'):
+            return False
+
+        # Twitter returns a window newest first: [oldest, until) is covered,
+        # [since, oldest's day + 1) remains (the overlap day is deduped by the sink)
+        since, until = parse_day(progress['since']), parse_day(progress['until'])
+        oldest = datetime.fromisoformat(progress['oldest'])
+        cut = min(until, oldest.date() + timedelta(days=1))
+        remaining_days = (cut - since).days
+        if remaining_days < 2 * self.min_days:
+            return False
+
+        covered = max(3600.0, (day_start(until) - oldest).total_seconds())
+        remaining = (oldest - day_start(since)).total_seconds()
+        expected = progress['fetched'] / covered * remaining
+        if expected <= self.split_threshold:
+            return False
+
+        middle = since + timedelta(days=remaining_days // 2)
+        children = [self.shard(middle, cut), self.shard(since, middle)]
+        progress['done'] = True
+        progress['split'] = [child.name for child in children]
+        self.splits += 1
+        logger.info(f"[{query.name}] ~{expected:.0f} tweets left, split into "
+                    f"{' + '.join(progress['split'])}")
+        for child in children:
+            self.queue.put_nowait(child)
+        return True
+
+    async def worker(self):
+        while True:
+            query = await self.queue.get()
+            try:
+                await self.run_query(query)
+            except Exception:
+                logger.exception(f"[{query.name}] shard failed")
+            finally:
+                self.queue.task_done()
+
+    async def backfill(self, since, until, window_days=30, concurrency=None):
+        """Run every shard of [since, until) until done (or given up), return a summary"""
+        since, until = parse_day(since), parse_day(until)
+        self.queue = asyncio.Queue()
+        for query in self.plan(since, until, window_days):
+            self.queue.put_nowait(query)
+
+        start = time.perf_counter()
+        workers = [asyncio.create_task(self.worker())
+                   for _ in range(concurrency or 2 * len(self.pool.slots))]
+        try:
+            await self.queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.cursors.save()
+        elapsed = time.perf_counter() - start
+
+        shards = self.shards()
+        unfinished = sorted(name for name, p in shards.items() if not p['done'])
+        summary = {
+            'shards': len(shards),
+            'splits': self.splits,
+            'unfinished': unfinished,
+            'new_tweets': self.sink.written,
+            'total_tweets': len(self.sink.seen),
+            'seconds': round(elapsed, 1),
+            'clients': self.pool.stats(),
+        }
+        logger.info(f"Backfill: {len(shards) - len(unfinished)}/{len(shards)} shards complete, "
+                    f"{self.sink.written} new tweets in {elapsed:.1f}s")
+        if unfinished:
+            logger.warning(f"{len(unfinished)} shards unfinished, rerun to resume: {unfinished}")
+        return summary
+
+
+# -- mock client -------------------------------------------------------------
+
+class MockArchiveClient(MockClient):
+    """
+    MockClient that honours since:/until: and spreads tweets over days:
+    `per_day` tweets a day, `dense_factor` times more during `dense_months`.
+    Ids only depend on the creation time, so overlapping shards return the
+    same tweets.
+    """
+
+    SINCE_UNTIL = re.compile(r'since:(\d{4}-\d{2}-\d{2})\s+until:(\d{4}-\d{2}-\d{2})')
+
+    def __init__(self, per_day=2, dense_months=(9, 10), dense_factor=25, **kwargs):
+        super().__init__(**kwargs)
+        self.per_day = per_day
+        self.dense_months = dense_months
+        self.dense_factor = dense_factor
+
+    def tweets(self, query):
+        match = self.SINCE_UNTIL.search(query)
+        if not match:
+            return super().tweets(query)
+        since, until = parse_day(match.group(1)), parse_day(match.group(2))
+        user = SimpleNamespace(screen_name='mock_user', name='Mock User')
+        tweets = []
+        day = until - timedelta(days=1)
+        while day >= since:
+            n = self.per_day * (self.dense_factor if day.month in self.dense_months else 1)
+            for k in reversed(range(n)):
+                created = day_start(day) + timedelta(seconds=k * 86400 // n)
+                tweets.append(SimpleNamespace(
+                    id=created.strftime('%Y%m%d%H%M%S'), text=f"tweet du {created:%Y-%m-%d %H:%M}",
+                    created_at=created.strftime(TWITTER_TIME_FORMAT), user=user,
+                    retweet_count=0, favorite_count=0, reply_count=0, lang='fr'))
+            day -= timedelta(days=1)
+        return tweets
+
+
+# -- entry point -------------------------------------------------------------
+
+async def main_async(args):
+    if args.mock:
+        slots = [Slot(f"mock{i}", MockArchiveClient(rate_limit_every=args.mock_rate_limit_every,
+                                                    error_every=args.mock_error_every, seed=i),
+                      TokenBucket(args.rate, args.period, args.burst))
+                 for i in range(args.mock)]
+    else:
+        with open(args.accounts, encoding='utf-8') as f:
+            slots = await login_clients(json.load(f), args.rate, args.period, args.burst)
+    if not slots:
+        logger.error("No authenticated client available")
+        return
+
+    sink = CsvSink(args.output)
+    try:
+        backfill = Backfill(ClientPool(slots), sink, CursorStore(args.state), args.query,
+                            split_threshold=args.split_threshold, min_days=args.min_days)
+        summary = await backfill.backfill(args.since, args.until, args.window_days,
+                                          args.concurrency)
+    finally:
+        sink.close()
+    print(json.dumps(summary, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded historical twikit backfill")
+    parser.add_argument('--query', default=DEFAULT_QUERY, help='Search query without since:/until:')
+    parser.add_argument('--since', default='2020-01-01', help='First day (YYYY-MM-DD)')
+    parser.add_argument('--until', default='2025-09-01', help='Day after the last one (YYYY-MM-DD)')
+    parser.add_argument('--window-days', type=int, default=30, help='Initial shard size in days')
+    parser.add_argument('--split-threshold', type=int, default=1000,
+                        help='Split a shard when more tweets than this are expected in the rest of it')
+    parser.add_argument('--min-days', type=int, default=1, help='Smallest shard after splitting')
+    parser.add_argument('--accounts', default='accounts.json', help='JSON list of accounts')
+    parser.add_argument('-o', '--output', default='twikit_backfill.csv')
+    parser.add_argument('--state', default='twikit_backfill.json',
+                        help='Shard checkpoints used to resume interrupted runs')
+    parser.add_argument('--concurrency', type=int, help='Shards in flight (default: 2 per client)')
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE, help='Requests per period per client')
+    parser.add_argument('--period', type=float, default=DEFAULT_PERIOD, help='Period in seconds')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help='Bucket capacity')
+    parser.add_argument('--mock', type=int, nargs='?', const=2, default=0,
+                        help='Use N local mock clients instead of logging in (default: 2)')
+    parser.add_argument('--mock-rate-limit-every', type=int, default=0,
+                        help='Mock clients raise TooManyRequests every N requests')
+    parser.add_argument('--mock-error-every', type=int, default=0,
+                        help='Mock clients raise a network error every N requests')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if hasattr(asyncio, 'WindowsSelectorEventLoopPolicy'):
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
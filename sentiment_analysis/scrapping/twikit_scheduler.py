@@ -0,0 +1,410 @@
+#author: artemis
+"""
+Concurrent multi-query twikit scraper.
+
+Runs many search queries (hashtags, date windows, accounts...) at the same
+time over a pool of authenticated twikit clients:
+
+- each client has its own token bucket (default: 50 requests / 15 min, the
+  search limit of one account) instead of a fixed random sleep per page;
+  a TooManyRequests only pauses that client until its reset time, and the
+  page is retried on whichever client is free first;
+- the cursor of every query is saved after each page, so an interrupted run
+  resumes where it stopped;
+- tweets are appended to the output CSV page by page (deduplicated by id)
+  instead of accumulating in memory.
+
+    python twikit_scheduler.py --accounts accounts.json --queries queries.txt -o uvbf_tweets.csv
+    python twikit_scheduler.py --mock --queries queries.txt     # local mock client, no network
+
+accounts.json: [{"username": ..., "email": ..., "password": ..., "cookies": "acc1.json"}, ...]
+queries.txt:   one query per line, optionally "name<TAB>query"
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import random
+import time
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Optional
+
+from tweet_kit import TWEET_FIELDS, TooManyRequests, TwitterScraper, tweet_to_row
+
+logger = logging.getLogger(__name__)
+
+# Search endpoint limit for one account
+DEFAULT_RATE = 50
+DEFAULT_PERIOD = 15 * 60
+DEFAULT_BURST = 5
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per `period` seconds, at most `capacity` stored"""
+
+    def __init__(self, rate=DEFAULT_RATE, period=DEFAULT_PERIOD, capacity=DEFAULT_BURST):
+        self.fill_rate = rate / period
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+            self.updated = now
+
+    def wait_time(self):
+        """Seconds until a token is available (0 if one is available now)"""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.fill_rate
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                delay = self.wait_time()
+                if delay <= 0:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep(delay)
+
+    def block(self, seconds):
+        """No token before `seconds` from now, and the bucket restarts empty"""
+        now = time.monotonic()
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = self.blocked_until
+
+
+@dataclass
+class Slot:
+    name: str
+    client: object
+    bucket: TokenBucket
+    requests: int = 0
+    rate_limited: int = 0
+
+
+class ClientPool:
+    """
+    Authenticated clients handed out one request at a time, first free client
+    first. A client goes back to the queue only once its bucket has a token,
+    so a paused or exhausted client never holds up a request another client
+    could serve.
+    """
+
+    def __init__(self, slots):
+        self.slots = list(slots)
+        self.free = asyncio.Queue()
+        for slot in self.slots:
+            self.free.put_nowait(slot)
+
+    @asynccontextmanager
+    async def lease(self):
+        slot = await self.free.get()
+        try:
+            await slot.bucket.acquire()
+            slot.requests += 1
+            yield slot
+        finally:
+            self.release(slot)
+
+    def release(self, slot):
+        """Requeue slot now, or when its bucket is unblocked / refilled"""
+        wait = slot.bucket.wait_time()
+        if wait > 0:
+            asyncio.get_running_loop().call_later(wait, self.free.put_nowait, slot)
+        else:
+            self.free.put_nowait(slot)
+
+    def stats(self):
+        return {slot.name: {'requests': slot.requests, 'rate_limited': slot.rate_limited}
+                for slot in self.slots}
+
+
+class CursorStore:
+    """Per-query progress ({cursor, count, done}) persisted as JSON after every page"""
+
+    def __init__(self, path):
+        self.path = path
+        self.state = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.state = json.load(f)
+
+    def get(self, key):
+        return self.state.setdefault(key, {'cursor': None, 'count': 0, 'done': False})
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+class CsvSink:
+    """Appends tweet rows to a CSV as they arrive, skipping ids already written"""
+
+    def __init__(self, path, fields=TWEET_FIELDS + ['query']):
+        self.path = path
+        self.fields = fields
+        self.seen = set()
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            with open(path, encoding='utf-8', newline='') as f:
+                self.seen = {row['id'] for row in csv.DictReader(f)}
+        self.file = open(path, 'a', encoding='utf-8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=fields, extrasaction='ignore')
+        if not exists:
+            self.writer.writeheader()
+        self.written = 0
+
+    def write(self, rows):
+        """Write new rows, return how many were new"""
+        new = 0
+        for row in rows:
+            key = str(row['id'])
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            self.writer.writerow(row)
+            new += 1
+        self.file.flush()
+        self.written += new
+        return new
+
+    def close(self):
+        self.file.close()
+
+
+@dataclass
+class Query:
+    name: str
+    text: str
+    product: str = 'Latest'
+    max_tweets: Optional[int] = None
+
+
+class Scheduler:
+    def __init__(self, pool, sink, cursors, page_size=20, max_errors=5):
+        self.pool = pool
+        self.sink = sink
+        self.cursors = cursors
+        self.page_size = page_size
+        self.max_errors = max_errors
+
+    async def fetch_page(self, query, cursor):
+        """One search request on the first free client; rate limits retry on another"""
+        while True:
+            async with self.pool.lease() as slot:
+                try:
+                    return await slot.client.search_tweet(query.text, query.product,
+                                                          count=self.page_size, cursor=cursor)
+                except TooManyRequests as e:
+                    slot.rate_limited += 1
+                    reset = getattr(e, 'rate_limit_reset', None)
+                    wait = max(1.0, reset - time.time()) if reset else DEFAULT_PERIOD / 3
+                    slot.bucket.block(wait)
+                    logger.warning(f"{slot.name} rate limited, paused {wait:.0f}s")
+
+    async def run_query(self, query):
+        progress = self.cursors.get(query.name)
+        if progress['done']:
+            logger.info(f"[{query.name}] already complete ({progress['count']} tweets)")
+            return progress['count']
+
+        errors = 0
+        while not progress['done']:
+            if query.max_tweets and progress['count'] >= query.max_tweets:
+                break
+            try:
+                page = await self.fetch_page(query, progress['cursor'])
+            except Exception as e:
+                errors += 1
+                if errors >= self.max_errors:
+                    logger.error(f"[{query.name}] giving up after {errors} errors: {e}")
+                    return progress['count']
+                wait = min(300, 2 ** errors) + random.random()
+                logger.warning(f"[{query.name}] error {errors}/{self.max_errors}: {e}; "
+                               f"retrying in {wait:.0f}s")
+                await asyncio.sleep(wait)
+                continue
+            errors = 0
+
+            items = list(page or [])
+            rows = [dict(tweet_to_row(t), query=query.name) for t in items]
+            progress['count'] += self.sink.write(rows)
+            progress['cursor'] = getattr(page, 'next_cursor', None)
+            progress['done'] = not items or not progress['cursor']
+            stop = self.after_page(query, progress, items)
+            self.cursors.save()
+            logger.info(f"[{query.name}] +{len(items)} tweets, {progress['count']} total")
+            if stop:
+                break
+        return progress['count']
+
+    def after_page(self, query, progress, items):
+        """Hook called after each page (before the cursor is saved); True stops the query"""
+        return False
+
+    async def run(self, queries, concurrency=None):
+        """Run all queries, at most `concurrency` at once (default: 2 per client)"""
+        limit = asyncio.Semaphore(concurrency or 2 * len(self.pool.slots))
+
+        async def bounded(query):
+            async with limit:
+                return await self.run_query(query)
+
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(bounded(q) for q in queries))
+        elapsed = time.perf_counter() - start
+        logger.info(f"{len(queries)} queries, {self.sink.written} new tweets in {elapsed:.1f}s; "
+                    f"clients: {self.pool.stats()}")
+        return dict(zip((q.name for q in queries), counts))
+
+
+# -- mock client -------------------------------------------------------------
+
+class MockResult(list):
+    def __init__(self, items, next_cursor):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+class MockClient:
+    """
+    Offline stand-in for twikit.Client.search_tweet: serves `n_tweets`
+    synthetic tweets per query, raises TooManyRequests every
+    `rate_limit_every` requests and a generic error every `error_every`.
+    """
+
+    def __init__(self, n_tweets=200, latency=0.01, rate_limit_every=0, error_every=0, seed=0):
+        self.n_tweets = n_tweets
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.error_every = error_every
+        self.requests = 0
+        self.random = random.Random(seed)
+
+    def tweets(self, query):
+        """Every tweet the query matches, newest first"""
+        user = SimpleNamespace(screen_name='mock_user', name='Mock User')
+        return [
+            SimpleNamespace(id=f"{zlib.crc32(query.encode())}{i:06d}", text=f"{query} tweet {i}",
+                            created_at='Mon Sep 01 10:00:00 +0000 2025', user=user,
+                            retweet_count=self.random.randint(0, 5), favorite_count=0,
+                            reply_count=0, lang='fr')
+            for i in range(self.n_tweets)
+        ]
+
+    async def search_tweet(self, query, product='Latest', count=20, cursor=None):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+            error = TooManyRequests("mock rate limit")
+            error.rate_limit_reset = time.time() + 1
+            raise error
+        if self.error_every and self.requests % self.error_every == 0:
+            raise ConnectionError("mock network error")
+
+        tweets = self.tweets(query)
+        start = int(cursor or 0)
+        stop = min(start + count, len(tweets))
+        return MockResult(tweets[start:stop], str(stop) if stop < len(tweets) else None)
+
+
+# -- setup -------------------------------------------------------------------
+
+async def login_clients(accounts, rate=DEFAULT_RATE, period=DEFAULT_PERIOD, burst=DEFAULT_BURST):
+    """Log every account in (reusing saved cookies when present) and build the pool slots"""
+    slots = []
+    for account in accounts:
+        scraper = TwitterScraper(account['username'], account['email'], account['password'])
+        cookies = account.get('cookies')
+        if cookies and os.path.exists(cookies):
+            scraper.client.load_cookies(cookies)
+        elif await scraper.login():
+            if cookies:
+                scraper.client.save_cookies(cookies)
+        else:
+            logger.error(f"Login failed for {account['username']}, account skipped")
+            continue
+        slots.append(Slot(account['username'], scraper.client, TokenBucket(rate, period, burst)))
+    return slots
+
+
+def load_queries(path, max_tweets=None):
+    queries = []
+    with open(path, encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            name, _, text = line.partition('\t')
+            if not text:
+                name, text = f"q{i:03d}", line
+            queries.append(Query(name, text, max_tweets=max_tweets))
+    return queries
+
+
+async def main_async(args):
+    queries = load_queries(args.queries, args.max_tweets)
+    if args.mock:
+        slots = [Slot(f"mock{i}", MockClient(rate_limit_every=args.mock_rate_limit_every, seed=i),
+                      TokenBucket(args.rate, args.period, args.burst))
+                 for i in range(args.mock)]
+    else:
+        with open(args.accounts, encoding='utf-8') as f:
+            slots = await login_clients(json.load(f), args.rate, args.period, args.burst)
+    if not slots:
+        logger.error("No authenticated client available")
+        return
+
+    sink = CsvSink(args.output)
+    try:
+        scheduler = Scheduler(ClientPool(slots), sink, CursorStore(args.state))
+        counts = await scheduler.run(queries, args.concurrency)
+    finally:
+        sink.close()
+    for name, count in counts.items():
+        print(f"{name}: {count} tweets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent multi-query twikit scraper")
+    parser.add_argument('--accounts', default='accounts.json', help='JSON list of accounts')
+    parser.add_argument('--queries', required=True, help='Text file, one query per line')
+    parser.add_argument('-o', '--output', default='twikit_tweets.csv')
+    parser.add_argument('--state', default='twikit_cursors.json',
+                        help='Cursor file used to resume interrupted runs')
+    parser.add_argument('--max-tweets', type=int, help='Per-query limit')
+    parser.add_argument('--concurrency', type=int, help='Queries in flight (default: 2 per client)')
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE, help='Requests per period per client')
+    parser.add_argument('--period', type=float, default=DEFAULT_PERIOD, help='Period in seconds')
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help='Bucket capacity')
+    parser.add_argument('--mock', type=int, nargs='?', const=2, default=0,
+                        help='Use N local mock clients instead of logging in (default: 2)')
+    parser.add_argument('--mock-rate-limit-every', type=int, default=0,
+                        help='Mock clients raise TooManyRequests every N requests')
+    args = parser.parse_args()
+
+    if hasattr(asyncio, 'WindowsSelectorEventLoopPolicy'):
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark : aller-retour save_npz / load_npz contre le store .npy mmappé
+(sparse_store.py), plus l'extraction d'un ensemble d'entraînement de 80 %.
+
+    python bench_sparse_store.py --matrix tfidf_matrix.npz --repeat 20
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import load_npz, save_npz
+
+from sparse_store import open_csr, save_csr
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def dir_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark npz vs store mmappé")
+    parser.add_argument('--matrix', default='tfidf_matrix.npz', help='Matrice .npz source')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Empiler la matrice N fois pour simuler un gros corpus')
+    args = parser.parse_args()
+
+    X = load_npz(args.matrix).tocsr()
+    if args.repeat > 1:
+        X = sp.vstack([X] * args.repeat, format='csr')
+    print(f"Matrice {X.shape}, nnz={X.nnz:,}\n")
+
+    rng = np.random.default_rng(42)
+    idx_train = np.sort(rng.permutation(X.shape[0])[:int(0.8 * X.shape[0])])
+
+    tmp = tempfile.mkdtemp()
+    try:
+        npz_path = os.path.join(tmp, 'matrix.npz')
+        store_path = os.path.join(tmp, 'matrix_store')
+
+        timed("save_npz (compressé)", lambda: save_npz(npz_path, X))
+        X_npz = timed("load_npz", lambda: load_npz(npz_path))
+        timed("load_npz + X[idx_train]", lambda: load_npz(npz_path)[idx_train])
+
+        timed("save_csr (.npy bruts)", lambda: save_csr(X, store_path))
+        store = timed("open_csr (mmap)", lambda: open_csr(store_path))
+        X_store = timed("open_csr + rows(idx_train)", lambda: open_csr(store_path).rows(idx_train))
+
+        print(f"\nTaille npz:   {os.path.getsize(npz_path) / 1024:10.0f} Ko")
+        print(f"Taille store: {dir_size(store_path) / 1024:10.0f} Ko")
+
+        same = (X_npz != store.matrix).nnz == 0 and (X[idx_train] != X_store).nnz == 0
+        print(f"Résultats identiques: {same}")
+        if not same:
+            raise SystemExit(1)
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Vectorisation TF-IDF incrémentale.
+
+Le TfidfVectorizer du notebook refait fit_transform sur tout data_cleaned.csv
+à chaque nouvel ajout. Ici :
+
+- la tokenisation passe par un HashingVectorizer (sans état, même analyseur :
+  n-grammes (1, 2), strip_accents='unicode', lowercase) ;
+- les comptages bruts de chaque lot sont ajoutés au stockage sans réécrire les
+  lots précédents (un fichier par lot) ;
+- les fréquences de documents (df) et les fréquences totales sont mises à jour
+  par lot, et min_df / max_df / max_features / idf / sublinear_tf / norme l2
+  sont appliqués à la lecture. Cela ne coûte qu'un passage linéaire sur les
+  valeurs non nulles, sans re-tokeniser.
+
+La sémantique suit celle de TfidfVectorizer (smooth_idf=True), aux collisions
+du hachage près (2**20 colonnes par défaut).
+
+Les documents ne peuvent qu'être ajoutés à la fin : la ligne i de matrix()
+est le i-ème document reçu. Une empreinte de la suite des textes déjà reçus
+est gardée dans l'état, et check_prefix vérifie qu'un corpus commence bien
+par eux (ni suppression, ni réordonnancement, ni modification) avant de
+n'ajouter que sa fin.
+
+    inc = IncrementalTfidf.load_or_create("tfidf_incremental")
+    inc.check_prefix(tweets)
+    inc.partial_fit(tweets[inc.n_docs:])
+    inc.save("tfidf_incremental")
+    X_tfidf = inc.matrix()
+"""
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+PARAMS_FILE = "params.json"
+STATS_FILE = "stats.npz"
+BATCH_PATTERN = "counts_{:05d}.npz"
+
+
+def text_fingerprint(texts, offset=0):
+    """
+    Empreinte 64 bits d'une suite de textes commençant à la position offset :
+    somme des hachages pondérés par la position, donc additive d'un lot à
+    l'autre et sensible à l'ordre
+    """
+    values = np.array(['' if text is None else str(text) for text in texts], dtype=object)
+    if not len(values):
+        return 0
+    hashes = pd.util.hash_array(values, categorize=False)
+    weights = 2 * np.arange(offset, offset + len(values), dtype=np.uint64) + np.uint64(1)
+    with np.errstate(over='ignore'):
+        return int((hashes * weights).sum(dtype=np.uint64))
+
+
+class IncrementalTfidf:
+    def __init__(self, n_features=2 ** 20, min_df=3, max_df=0.8, max_features=5000,
+                 ngram_range=(1, 2), sublinear_tf=True, strip_accents='unicode',
+                 lowercase=True):
+        self.params = {
+            'n_features': n_features,
+            'min_df': min_df,
+            'max_df': max_df,
+            'max_features': max_features,
+            'ngram_range': list(ngram_range),
+            'sublinear_tf': sublinear_tf,
+            'strip_accents': strip_accents,
+            'lowercase': lowercase,
+        }
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=tuple(ngram_range),
+            strip_accents=strip_accents,
+            lowercase=lowercase,
+            analyzer='word',
+            alternate_sign=False,
+            norm=None,
+        )
+        self.n_docs = 0
+        self.fingerprint = 0
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.term_freq = np.zeros(n_features, dtype=np.float64)
+        self.batches = []
+        self._saved_batches = 0
+
+    # -- mise à jour -------------------------------------------------------
+
+    def _counts(self, texts):
+        return self.hasher.transform(texts).tocsr().astype(np.float32)
+
+    def partial_fit(self, texts):
+        """Ajoute un lot de documents : comptages stockés, df et tf mis à jour"""
+        texts = list(texts)
+        counts = self._counts(texts)
+        counts.sum_duplicates()
+        self.fingerprint = (self.fingerprint + text_fingerprint(texts, self.n_docs)) % 2 ** 64
+        self.doc_freq += np.bincount(counts.indices, minlength=self.params['n_features'])
+        self.term_freq += np.asarray(counts.sum(axis=0)).ravel()
+        self.n_docs += counts.shape[0]
+        self.batches.append(counts)
+        return self
+
+    def check_prefix(self, texts):
+        """
+        ValueError si texts ne commence pas par les n_docs documents déjà
+        reçus (état sans empreinte, d'une ancienne version : pas de contrôle)
+        """
+        texts = list(texts)
+        if self.fingerprint is None:
+            return
+        if len(texts) < self.n_docs or text_fingerprint(texts[:self.n_docs]) != self.fingerprint:
+            raise ValueError(f"Le corpus ne commence pas par les {self.n_docs} documents déjà "
+                             f"vectorisés (lignes supprimées, modifiées ou réordonnées) : "
+                             f"reconstruire l'état incrémental")
+
+    # -- sélection des features et pondération -----------------------------
+
+    def selected_features(self):
+        """Colonnes hachées retenues (min_df, max_df, max_features), triées"""
+        min_df, max_df = self.params['min_df'], self.params['max_df']
+        min_count = min_df if isinstance(min_df, int) else min_df * self.n_docs
+        max_count = max_df if isinstance(max_df, int) else max_df * self.n_docs
+
+        mask = (self.doc_freq >= min_count) & (self.doc_freq <= max_count)
+        candidates = np.flatnonzero(mask)
+        limit = self.params['max_features']
+        if limit is not None and len(candidates) > limit:
+            order = np.argsort(-self.term_freq[candidates], kind='mergesort')
+            candidates = np.sort(candidates[order[:limit]])
+        return candidates
+
+    def idf(self, features=None):
+        """idf lissé comme TfidfTransformer(smooth_idf=True)"""
+        if features is None:
+            features = self.selected_features()
+        df = self.doc_freq[features]
+        return np.log((1 + self.n_docs) / (1 + df)) + 1
+
+    def _weight(self, counts, features):
+        X = counts[:, features].tocsr()
+        X.sum_duplicates()
+        if self.params['sublinear_tf']:
+            np.log(X.data, out=X.data)
+            X.data += 1
+        X.data *= self.idf(features)[X.indices].astype(X.dtype)
+        return normalize(X, norm='l2', copy=False)
+
+    def transform(self, texts):
+        """TF-IDF de nouveaux textes avec l'état courant (sans le modifier)"""
+        return self._weight(self._counts(texts), self.selected_features())
+
+    def counts(self):
+        """Comptages bruts de tous les documents stockés"""
+        if not self.batches:
+            return sp.csr_matrix((0, self.params['n_features']), dtype=np.float32)
+        return sp.vstack(self.batches, format='csr')
+
+    def matrix(self):
+        """Matrice TF-IDF de tous les documents stockés"""
+        return self._weight(self.counts(), self.selected_features())
+
+    def feature_names(self, texts, features=None):
+        """
+        Noms des colonnes retenues, retrouvés en re-hachant les n-grammes de
+        texts (le hachage n'est pas inversible)
+        """
+        if features is None:
+            features = self.selected_features()
+        wanted = {int(f): i for i, f in enumerate(features)}
+        names = [None] * len(features)
+        analyzer = self.hasher.build_analyzer()
+        n_features = self.params['n_features']
+        for text in texts:
+            for gram in analyzer(text):
+                # Même calcul d'indice que FeatureHasher
+                h = murmurhash3_32(gram, seed=0)
+                if h == -2147483648:
+                    index = (2147483647 - (n_features - 1)) % n_features
+                else:
+                    index = abs(h) % n_features
+                i = wanted.get(index)
+                if i is not None and names[i] is None:
+                    names[i] = gram
+        return names
+
+    # -- persistance ---------------------------------------------------------
+
+    def save(self, directory):
+        """Sauvegarde l'état ; seuls les lots ajoutés depuis le dernier save sont écrits"""
+        os.makedirs(directory, exist_ok=True)
+        for i in range(self._saved_batches, len(self.batches)):
+            sp.save_npz(os.path.join(directory, BATCH_PATTERN.format(i)),
+                        self.batches[i], compressed=False)
+        self._saved_batches = len(self.batches)
+
+        np.savez(os.path.join(directory, STATS_FILE), doc_freq=self.doc_freq,
+                 term_freq=self.term_freq)
+        with open(os.path.join(directory, PARAMS_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'params': self.params, 'n_docs': self.n_docs,
+                       'n_batches': len(self.batches), 'fingerprint': self.fingerprint}, f, indent=2)
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, PARAMS_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        inc = cls(**meta['params'])
+        inc.n_docs = meta['n_docs']
+        inc.fingerprint = meta.get('fingerprint')
+        with np.load(os.path.join(directory, STATS_FILE)) as stats:
+            inc.doc_freq = stats['doc_freq']
+            inc.term_freq = stats['term_freq']
+        paths = sorted(glob.glob(os.path.join(directory, "counts_*.npz")))[:meta['n_batches']]
+        inc.batches = [sp.load_npz(path) for path in paths]
+        inc._saved_batches = len(inc.batches)
+        return inc
+
+    @classmethod
+    def load_or_create(cls, directory, **params):
+        if os.path.exists(os.path.join(directory, PARAMS_FILE)):
+            return cls.load(directory)
+        return cls(**params)
@@ -0,0 +1,109 @@
+"""
+Stockage d'une matrice CSR en fichiers .npy bruts, ouverts en mémoire mappée.
+
+save_npz / load_npz compressent puis décompressent toute la matrice en RAM à
+chaque ouverture. Ici data / indices / indptr sont écrits tels quels en .npy
+et rouverts avec np.load(mmap_mode='r') : seules les pages lues sont chargées,
+une tranche de lignes contiguës est une vue sans copie, et une sélection de
+lignes quelconque ne copie que les lignes demandées.
+
+    save_csr(X_tfidf, "tfidf_matrix")
+    store = open_csr("tfidf_matrix")
+    X_train = store.rows(idx_train)
+"""
+import json
+import os
+
+import numpy as np
+import scipy.sparse as sp
+
+META_FILE = "meta.json"
+ARRAYS = ("data", "indices", "indptr")
+
+
+def save_csr(matrix, directory):
+    """Écrit la matrice (convertie en CSR) dans directory/{data,indices,indptr}.npy"""
+    matrix = sp.csr_matrix(matrix)
+    matrix.sum_duplicates()
+    os.makedirs(directory, exist_ok=True)
+    for name in ARRAYS:
+        np.save(os.path.join(directory, f"{name}.npy"), getattr(matrix, name))
+    with open(os.path.join(directory, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'shape': list(matrix.shape), 'nnz': int(matrix.nnz),
+                   'dtype': str(matrix.dtype)}, f)
+    return directory
+
+
+class CSRStore:
+    """Matrice CSR adossée à des tableaux mmappés"""
+
+    def __init__(self, data, indices, indptr, shape):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = tuple(shape)
+
+    @property
+    def nnz(self):
+        return int(self.indptr[-1])
+
+    def _csr(self, data, indices, indptr, n_rows):
+        # Les index sont déjà triés et sans doublons (save_csr)
+        m = sp.csr_matrix((data, indices, indptr), shape=(n_rows, self.shape[1]), copy=False)
+        m.has_sorted_indices = True
+        return m
+
+    @property
+    def matrix(self):
+        """Toute la matrice, sans copie (les pages sont lues à la demande)"""
+        return self._csr(self.data, self.indices, self.indptr, self.shape[0])
+
+    def slice(self, start, stop):
+        """Lignes start:stop, vue sans copie de data / indices"""
+        lo, hi = int(self.indptr[start]), int(self.indptr[stop])
+        indptr = np.asarray(self.indptr[start:stop + 1]) - lo
+        return self._csr(self.data[lo:hi], self.indices[lo:hi], indptr, stop - start)
+
+    def rows(self, index):
+        """
+        Lignes d'index quelconques, dans l'ordre donné. Une plage contiguë
+        croissante est renvoyée sans copie ; sinon seules ces lignes sont copiées.
+        """
+        index = np.asarray(index, dtype=np.int64)
+        if len(index) == 0:
+            return self._csr(self.data[:0], self.indices[:0], np.zeros(1, dtype=self.indptr.dtype), 0)
+        if len(index) > 1 and np.all(np.diff(index) == 1):
+            return self.slice(int(index[0]), int(index[-1]) + 1)
+
+        starts = np.asarray(self.indptr[index], dtype=np.int64)
+        stops = np.asarray(self.indptr[index + 1], dtype=np.int64)
+        lengths = stops - starts
+        indptr = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        # Positions à lire dans data / indices : une plage par ligne, lue dans
+        # l'ordre des lignes demandées (accès séquentiel si index est trié)
+        positions = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return self._csr(self.data[positions], self.indices[positions], indptr, len(index))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.shape[0])
+            if step == 1:
+                return self.slice(start, stop)
+            return self.rows(np.arange(start, stop, step))
+        return self.rows(key)
+
+    def to_memory(self):
+        """Copie complète en RAM"""
+        return sp.csr_matrix((np.array(self.data), np.array(self.indices), np.array(self.indptr)),
+                             shape=self.shape)
+
+
+def open_csr(directory, mmap=True):
+    """Ouvre un store écrit par save_csr (mmap_mode='r' par défaut)"""
+    with open(os.path.join(directory, META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    mode = 'r' if mmap else None
+    arrays = [np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in ARRAYS]
+    return CSRStore(*arrays, shape=meta['shape'])